@@ -1,31 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.database.database import async_session_maker
-from app.repositories.user import UserRepository
-from app.repositories.service import ServiceRepository
-from app.repositories.master import MasterRepository
-from app.repositories.session import SessionRepository
-from app.repositories.appointment import AppointmentRepository
-from app.repositories.review import ReviewRepository
-from app.schemes.user import UserInDB, UserCreate, UserUpdate
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from app.database.database import read_engine, slow_query_log
+from app.database.backup import BackupError, backup_manager
+from app.database.maintenance import maintenance
+from app.database.db_manager import DBManager
+from app.database.writer import WriteQueue, write_queue
+from app.schemes.user import UserInDB, UserCreate, UserUpdate, UserClaims
 from app.schemes.service import ServiceCreate, ServiceUpdate, ServiceInDB
 from app.schemes.master import MasterCreate, MasterUpdate, MasterInDB
 from app.schemes.appointment import AppointmentInDB
 from app.schemes.review import ReviewInDB
-from app.dependencies import get_current_user
+from app.schemes.bulk_import import ImportResult
+from app.dependencies import get_current_user, get_current_claims, get_db_manager, get_write_queue, sparse_fields
+from app.services.auth import password_pool
+from app.services.import_service import ImportService
+from app.services.archive_service import ArchiveService
+from app.config import settings
+from app.utils.serialization import json_list
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-async def get_db():
-    async with async_session_maker() as session:
-        yield session
-
-
 @router.get("/dashboard")
-async def get_admin_dashboard(current_user: UserInDB = Depends(get_current_user)):
+async def get_admin_dashboard(current_user: UserClaims = Depends(get_current_claims)):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -39,7 +41,7 @@ async def get_admin_dashboard(current_user: UserInDB = Depends(get_current_user)
 async def create_service(
     service: ServiceCreate,
     current_user: UserInDB = Depends(get_current_user),
-    service_repository: ServiceRepository = Depends(lambda: ServiceRepository(next(get_db())))
+    writer: WriteQueue = Depends(get_write_queue)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -47,7 +49,7 @@ async def create_service(
             detail="Not authorized to create services"
         )
     
-    db_service = await service_repository.create(service)
+    db_service = await writer.submit(lambda db: db.services.create(service))
     return db_service
 
 
@@ -56,7 +58,7 @@ async def update_service(
     service_id: int,
     service_update: ServiceUpdate,
     current_user: UserInDB = Depends(get_current_user),
-    service_repository: ServiceRepository = Depends(lambda: ServiceRepository(next(get_db())))
+    writer: WriteQueue = Depends(get_write_queue)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -64,7 +66,7 @@ async def update_service(
             detail="Not authorized to update services"
         )
     
-    db_service = await service_repository.update(service_id, service_update)
+    db_service = await writer.submit(lambda db: db.services.update(service_id, service_update))
     if not db_service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,7 +80,7 @@ async def update_service(
 async def delete_service(
     service_id: int,
     current_user: UserInDB = Depends(get_current_user),
-    service_repository: ServiceRepository = Depends(lambda: ServiceRepository(next(get_db())))
+    writer: WriteQueue = Depends(get_write_queue)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -86,7 +88,14 @@ async def delete_service(
             detail="Not authorized to delete services"
         )
     
-    success = await service_repository.delete(service_id)
+    try:
+        success = await writer.submit(lambda db: db.services.delete(service_id))
+    except IntegrityError:
+        # Sessions and appointments reference services with ON DELETE RESTRICT
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Service is still used by sessions or appointments"
+        )
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -100,8 +109,9 @@ async def delete_service(
 async def get_services(
     skip: int = 0, 
     limit: int = 100,
-    current_user: UserInDB = Depends(get_current_user),
-    service_repository: ServiceRepository = Depends(lambda: ServiceRepository(next(get_db())))
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(ServiceInDB)),
+    current_user: UserClaims = Depends(get_current_claims),
+    db: DBManager = Depends(get_db_manager)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -109,16 +119,15 @@ async def get_services(
             detail="Not authorized to view services"
         )
     
-    services = await service_repository.get_all(skip=skip, limit=limit)
-    return services
+    services = await db.services.get_all(skip=skip, limit=limit, fields=fields)
+    return json_list(ServiceInDB, services, fields=fields)
 
 
 @router.post("/masters", response_model=MasterInDB)
 async def create_master(
     master: MasterCreate,
     current_user: UserInDB = Depends(get_current_user),
-    master_repository: MasterRepository = Depends(lambda: MasterRepository(next(get_db()))),
-    user_repository: UserRepository = Depends(lambda: UserRepository(next(get_db())))
+    writer: WriteQueue = Depends(get_write_queue)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -126,15 +135,17 @@ async def create_master(
             detail="Not authorized to create masters"
         )
     
-    # Verify that the user exists
-    user = await user_repository.get_by_id(master.user_id)
-    if not user or user.role != "master":
-        raise HTTPException(
-            status_code=status.HTTP_40_BAD_REQUEST,
-            detail="User does not exist or is not a master"
-        )
+    async def create(db: DBManager):
+        # Verify that the user exists
+        user = await db.users.get_by_id(master.user_id)
+        if not user or user.role != "master":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User does not exist or is not a master"
+            )
+        return await db.masters.create(master)
     
-    db_master = await master_repository.create(master)
+    db_master = await writer.submit(create)
     return db_master
 
 
@@ -143,7 +154,7 @@ async def update_master(
     master_id: int,
     master_update: MasterUpdate,
     current_user: UserInDB = Depends(get_current_user),
-    master_repository: MasterRepository = Depends(lambda: MasterRepository(next(get_db())))
+    writer: WriteQueue = Depends(get_write_queue)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -151,7 +162,7 @@ async def update_master(
             detail="Not authorized to update masters"
         )
     
-    db_master = await master_repository.update(master_id, master_update)
+    db_master = await writer.submit(lambda db: db.masters.update(master_id, master_update))
     if not db_master:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -165,7 +176,7 @@ async def update_master(
 async def delete_master(
     master_id: int,
     current_user: UserInDB = Depends(get_current_user),
-    master_repository: MasterRepository = Depends(lambda: MasterRepository(next(get_db())))
+    writer: WriteQueue = Depends(get_write_queue)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -173,7 +184,7 @@ async def delete_master(
             detail="Not authorized to delete masters"
         )
     
-    success = await master_repository.delete(master_id)
+    success = await writer.submit(lambda db: db.masters.delete(master_id))
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -187,8 +198,9 @@ async def delete_master(
 async def get_masters(
     skip: int = 0, 
     limit: int = 100,
-    current_user: UserInDB = Depends(get_current_user),
-    master_repository: MasterRepository = Depends(lambda: MasterRepository(next(get_db())))
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(MasterInDB)),
+    current_user: UserClaims = Depends(get_current_claims),
+    db: DBManager = Depends(get_db_manager)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -196,16 +208,17 @@ async def get_masters(
             detail="Not authorized to view masters"
         )
     
-    masters = await master_repository.get_all(skip=skip, limit=limit)
-    return masters
+    masters = await db.masters.get_all(skip=skip, limit=limit, fields=fields)
+    return json_list(MasterInDB, masters, fields=fields)
 
 
 @router.get("/appointments", response_model=List[AppointmentInDB])
 async def get_appointments(
     skip: int = 0, 
     limit: int = 100,
-    current_user: UserInDB = Depends(get_current_user),
-    appointment_repository: AppointmentRepository = Depends(lambda: AppointmentRepository(next(get_db())))
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(AppointmentInDB)),
+    current_user: UserClaims = Depends(get_current_claims),
+    db: DBManager = Depends(get_db_manager)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -213,12 +226,12 @@ async def get_appointments(
             detail="Not authorized to view appointments"
         )
     
-    appointments = await appointment_repository.get_all(skip=skip, limit=limit)
-    return appointments
+    appointments = await db.appointments.get_all(skip=skip, limit=limit, fields=fields)
+    return json_list(AppointmentInDB, appointments, fields=fields)
 
 
 @router.get("/statistics")
-async def get_statistics(current_user: UserInDB = Depends(get_current_user)):
+async def get_statistics(current_user: UserClaims = Depends(get_current_claims)):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -236,7 +249,7 @@ async def get_statistics(current_user: UserInDB = Depends(get_current_user)):
 
 
 @router.get("/revenue")
-async def get_revenue(current_user: UserInDB = Depends(get_current_user)):
+async def get_revenue(current_user: UserClaims = Depends(get_current_claims)):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -248,4 +261,166 @@ async def get_revenue(current_user: UserInDB = Depends(get_current_user)):
         "today_revenue": 0.0,
         "monthly_revenue": 0.0,
         "yearly_revenue": 0.0
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/password-hashing")
+async def get_password_hashing_stats(current_user: UserClaims = Depends(get_current_claims)):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view password hashing statistics"
+        )
+    
+    return password_pool.stats()
+
+
+@router.get("/database")
+async def get_database_stats(current_user: UserClaims = Depends(get_current_claims)):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view database statistics"
+        )
+    
+    return {
+        "write_queue": write_queue.stats(),
+        "read_pool": read_engine.pool.status(),
+        "maintenance": maintenance.stats(),
+    }
+
+
+@router.post("/maintenance")
+async def run_maintenance(
+    include_quiet: bool = False,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to run database maintenance"
+        )
+
+    # include_quiet also runs the WAL checkpoint and incremental vacuum
+    # outside the quiet hours
+    return {"runs": await maintenance.run_once(include_quiet=include_quiet)}
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(limit: int = 50, current_user: UserClaims = Depends(get_current_claims)):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view database statistics"
+        )
+
+    # Only this process's recent entries; the log file keeps the full history
+    return {
+        "enabled": settings.SLOW_QUERY_LOG_ENABLED,
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "logged": slow_query_log.logged,
+        "entries": slow_query_log.entries(limit),
+    }
+
+
+@router.post("/archive")
+async def archive_history(
+    horizon_days: Optional[int] = None,
+    current_user: UserInDB = Depends(get_current_user),
+    writer: WriteQueue = Depends(get_write_queue)
+):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to archive history"
+        )
+
+    horizon_days = settings.ARCHIVE_HORIZON_DAYS if horizon_days is None else horizon_days
+    moved = await ArchiveService(writer).archive(horizon_days, settings.ARCHIVE_BATCH_SIZE)
+    return {"horizon_days": horizon_days, "archived": moved}
+
+
+@router.get("/backups")
+async def list_backups(current_user: UserClaims = Depends(get_current_claims)):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to manage backups"
+        )
+
+    return backup_manager.list_backups()
+
+
+@router.post("/backups")
+async def create_backup(current_user: UserInDB = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to manage backups"
+        )
+
+    try:
+        return await backup_manager.create()
+    except BackupError as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error))
+
+
+@router.post("/backups/{name}/verify")
+async def verify_backup(name: str, current_user: UserInDB = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to manage backups"
+        )
+
+    try:
+        return await backup_manager.verify(name)
+    except BackupError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error))
+
+
+async def _read_import_rows(request: Request) -> List[Dict[str, Any]]:
+    body = (await request.body()).decode("utf-8-sig")
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        # Empty cells mean "not given", so schema defaults apply
+        rows = [
+            {name: value for name, value in row.items() if value not in ("", None)}
+            for row in csv.DictReader(io.StringIO(body))
+        ]
+    else:
+        try:
+            rows = json.loads(body)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Body must be a JSON array of objects or CSV with a header row"
+            )
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Body must be a JSON array of objects or CSV with a header row"
+            )
+    
+    if len(rows) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_IMPORT_MAX_ROWS} rows per import"
+        )
+    return rows
+
+
+@router.post("/import/{entity}", response_model=ImportResult)
+async def import_rows(
+    entity: Literal["users", "masters", "services", "sessions"],
+    request: Request,
+    current_user: UserInDB = Depends(get_current_user),
+    writer: WriteQueue = Depends(get_write_queue)
+):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to import data"
+        )
+    
+    rows = await _read_import_rows(request)
+    return await ImportService(writer).import_rows(entity, rows)
\ No newline at end of file
@@ -1,60 +1,66 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.database.database import async_session_maker
-from app.repositories.user import UserRepository
+from app.database.db_manager import DBManager
+from app.database.writer import WriteQueue
 from app.services.auth import AuthService
+from app.utils.worker_pool import PoolSaturatedError
 from app.schemes.user import UserCreate, UserInDB, Token, TokenData
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_db_manager, get_write_queue, limit_login
+from app.config import settings
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-async def get_db():
-    async with async_session_maker() as session:
-        yield session
-
-
-async def get_user_repository(db: AsyncSession = Depends(get_db)):
-    return UserRepository(db)
-
-
-async def get_auth_service(user_repository: UserRepository = Depends(get_user_repository)):
-    return AuthService(user_repository)
+async def get_auth_service(db: DBManager = Depends(get_db_manager)):
+    return AuthService(db.users)
 
 
 @router.post("/register", response_model=UserInDB)
-async def register(user: UserCreate, user_repository: UserRepository = Depends(get_user_repository), auth_service: AuthService = Depends(get_auth_service)):
+async def register(user: UserCreate, db: DBManager = Depends(get_db_manager), writer: WriteQueue = Depends(get_write_queue), auth_service: AuthService = Depends(get_auth_service)):
     # Check if user already exists
-    existing_user = await user_repository.get_by_username(user.username)
+    existing_user = await db.users.get_by_username(user.username)
     if existing_user:
         raise HTTPException(
-            status_code=status.HTTP_40_BAD_REQUEST,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
     
-    existing_email = await user_repository.get_by_email(user.email)
+    existing_email = await db.users.get_by_email(user.email)
     if existing_email:
         raise HTTPException(
-            status_code=status.HTTP_40_BAD_REQUEST,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     # Hash the password
-    hashed_password = auth_service.get_password_hash(user.password)
+    try:
+        hashed_password = await auth_service.get_password_hash(user.password)
+    except PoolSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many registrations in progress, try again later",
+            headers={"Retry-After": "1"},
+        )
     user.password = hashed_password
     
     # Create the user
-    db_user = await user_repository.create(user)
+    db_user = await writer.submit(lambda db: db.users.create(user))
     return db_user
 
 
-@router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), user_repository: UserRepository = Depends(get_user_repository), auth_service: AuthService = Depends(get_auth_service)):
-    user = await auth_service.authenticate_user(form_data.username, form_data.password)
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_login)])
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), auth_service: AuthService = Depends(get_auth_service)):
+    try:
+        user = await auth_service.authenticate_user(form_data.username, form_data.password)
+    except PoolSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, try again later",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,7 +68,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), user_repositor
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=30)
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = auth_service.create_access_token(
         data={"sub": user.username, "user_id": user.id, "role": user.role}, 
         expires_delta=access_token_expires
@@ -1,75 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.database.database import async_session_maker
-from app.repositories.user import UserRepository
-from app.repositories.service import ServiceRepository
-from app.repositories.master import MasterRepository
-from app.repositories.session import SessionRepository
-from app.repositories.appointment import AppointmentRepository
-from app.repositories.review import ReviewRepository
-from app.schemes.user import UserInDB
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from typing import List, Optional, Tuple
+from app.database.db_manager import DBManager
+from app.database.writer import WriteQueue
+from app.schemes.user import UserInDB, UserClaims
 from app.schemes.service import ServiceInDB
 from app.schemes.master import MasterInDB
 from app.schemes.session import SessionInDB
 from app.schemes.appointment import AppointmentCreate, AppointmentInDB
 from app.schemes.review import ReviewCreate, ReviewInDB
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_claims, get_db_manager, get_write_queue, limit_booking, sparse_fields
+from app.utils.metrics import bookings
+from app.utils.serialization import json_list
+from app.utils.table_versions import not_modified, table_versions
+from app.config import settings
 
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
 
-async def get_db():
-    async with async_session_maker() as session:
-        yield session
-
-
 @router.get("/services", response_model=List[ServiceInDB])
 async def get_services(
+    request: Request,
     skip: int = 0, 
     limit: int = 100, 
-    service_repository: ServiceRepository = Depends(lambda: ServiceRepository(next(get_db())))
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(ServiceInDB)),
+    db: DBManager = Depends(get_db_manager)
 ):
-    services = await service_repository.get_all(skip=skip, limit=limit)
-    return services
+    # The tag is taken before the query: a write committed in between
+    # leaves an older tag on newer data, which only costs a refetch.
+    etag = table_versions.etag("services", skip, limit, *(fields or ()))
+    cached = not_modified(request, etag, settings.SERVICES_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    services = await db.services.get_all(skip=skip, limit=limit, fields=fields)
+    response = json_list(ServiceInDB, services, fields=fields)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = settings.SERVICES_CACHE_CONTROL
+    return response
 
 
 @router.get("/masters", response_model=List[MasterInDB])
 async def get_masters(
+    request: Request,
     skip: int = 0, 
     limit: int = 100, 
-    master_repository: MasterRepository = Depends(lambda: MasterRepository(next(get_db())))
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(MasterInDB)),
+    db: DBManager = Depends(get_db_manager)
 ):
-    masters = await master_repository.get_all(skip=skip, limit=limit)
-    return masters
+    etag = table_versions.etag("masters", skip, limit, *(fields or ()))
+    cached = not_modified(request, etag, settings.MASTERS_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    masters = await db.masters.get_all(skip=skip, limit=limit, fields=fields)
+    response = json_list(MasterInDB, masters, fields=fields)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = settings.MASTERS_CACHE_CONTROL
+    return response
 
 
 @router.get("/sessions/available", response_model=List[SessionInDB])
 async def get_available_sessions(
     master_id: int,
     date: str,  # Format: YYYY-MM-DD
-    db: AsyncSession = Depends(get_db)
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(SessionInDB)),
+    db: DBManager = Depends(get_db_manager)
 ):
     from datetime import datetime
     try:
         date_obj = datetime.strptime(date, "%Y-%m-%d")
     except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_40_BAD_REQUEST,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid date format. Use YYYY-MM-DD"
         )
     
-    session_repository = SessionRepository(db)
-    available_sessions = await session_repository.get_available_by_master_and_date(master_id, date_obj)
-    return available_sessions
+    available_sessions = await db.sessions.get_available_by_master_and_date(master_id, date_obj, fields=fields)
+    return json_list(SessionInDB, available_sessions, fields=fields)
 
 
-@router.post("/appointments/book", response_model=AppointmentInDB)
+@router.post("/appointments/book", response_model=AppointmentInDB, dependencies=[Depends(limit_booking)])
 async def book_appointment(
     appointment: AppointmentCreate,
     current_user: UserInDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    writer: WriteQueue = Depends(get_write_queue)
 ):
     # Ensure the client can only book for themselves
     if appointment.client_id != current_user.id:
@@ -78,42 +93,46 @@ async def book_appointment(
             detail="Cannot book appointment for another user"
         )
     
-    appointment_repository = AppointmentRepository(db)
-    session_repository = SessionRepository(db)
-    
-    # Check if session exists and is available
-    session = await session_repository.get_by_id(appointment.session_id)
-    if not session or not session.is_available:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Session is not available"
-        )
-    
-    # Create the appointment
-    db_appointment = await appointment_repository.create(appointment)
-    
-    # Update session availability
-    session.is_available = False
-    await db.commit()
-    await db.refresh(session)
+    # The availability check runs on the writer, so two bookings for the
+    # same session cannot both see it as free.
+    async def book(db: DBManager):
+        # Mark the session as taken if it exists and is available
+        if not await db.sessions.reserve(appointment.session_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Session is not available"
+            )
+        
+        # Create the appointment
+        return await db.appointments.create(appointment)
     
+    try:
+        db_appointment = await writer.submit(book)
+    except HTTPException:
+        bookings.inc("unavailable")
+        raise
+    bookings.inc("booked")
     return db_appointment
 
 
 @router.get("/appointments/my", response_model=List[AppointmentInDB])
 async def get_my_appointments(
-    current_user: UserInDB = Depends(get_current_user),
-    appointment_repository: AppointmentRepository = Depends(lambda: AppointmentRepository(next(get_db())))
+    include_history: bool = False,
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(AppointmentInDB)),
+    current_user: UserClaims = Depends(get_current_claims),
+    db: DBManager = Depends(get_db_manager)
 ):
-    appointments = await appointment_repository.get_by_client_id(current_user.id)
-    return appointments
+    appointments = await db.appointments.get_by_client_id(
+        current_user.id, include_history=include_history, fields=fields
+    )
+    return json_list(AppointmentInDB, appointments, fields=fields)
 
 
 @router.post("/reviews", response_model=ReviewInDB)
 async def create_review(
     review: ReviewCreate,
     current_user: UserInDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    writer: WriteQueue = Depends(get_write_queue)
 ):
     # Ensure the client can only create reviews for themselves
     if review.client_id != current_user.id:
@@ -122,6 +141,5 @@ async def create_review(
             detail="Cannot create review for another user"
         )
     
-    review_repository = ReviewRepository(db)
-    db_review = await review_repository.create(review)
+    db_review = await writer.submit(lambda db: db.reviews.create(review))
     return db_review
\ No newline at end of file
@@ -1,34 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.database.database import async_session_maker
-from app.repositories.user import UserRepository
-from app.repositories.master import MasterRepository
-from app.repositories.session import SessionRepository
-from app.repositories.appointment import AppointmentRepository
-from app.repositories.review import ReviewRepository
+from typing import List, Optional, Tuple
+from app.database.db_manager import DBManager
+from app.database.writer import WriteQueue
 from app.schemes.user import UserInDB
 from app.schemes.master import MasterInDB
 from app.schemes.session import SessionUpdate, SessionInDB
 from app.schemes.appointment import AppointmentInDB, AppointmentUpdate
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_principal, get_db_manager, get_write_queue, sparse_fields
+from app.utils.principal_cache import Principal
+from app.utils.serialization import json_list, json_object
 
 
 router = APIRouter(prefix="/masters", tags=["masters"])
 
 
-async def get_db():
-    async with async_session_maker() as session:
-        yield session
-
-
 @router.get("/profile", response_model=MasterInDB)
 async def get_master_profile(
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(MasterInDB)),
     current_user: UserInDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: DBManager = Depends(get_db_manager)
 ):
-    master_repository = MasterRepository(db)
-    master = await master_repository.get_by_user_id(current_user.id)
+    master = await db.masters.get_by_user_id(current_user.id, fields=fields)
     
     if not master:
         raise HTTPException(
@@ -36,65 +28,66 @@ async def get_master_profile(
             detail="Master profile not found"
         )
     
-    return master
+    return json_object(MasterInDB, master, fields=fields)
 
 
 @router.get("/schedule", response_model=List[SessionInDB])
 async def get_master_schedule(
     date: str,  # Format: YYYY-MM-DD
-    current_user: UserInDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    include_history: bool = False,
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(SessionInDB)),
+    principal: Principal = Depends(get_current_principal),
+    db: DBManager = Depends(get_db_manager)
 ):
     from datetime import datetime
     try:
         date_obj = datetime.strptime(date, "%Y-%m-%d")
     except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_40_BAD_REQUEST,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid date format. Use YYYY-MM-DD"
         )
     
-    master_repository = MasterRepository(db)
-    master = await master_repository.get_by_user_id(current_user.id)
-    
-    if not master:
+    if principal.master_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Master profile not found"
         )
     
-    session_repository = SessionRepository(db)
-    sessions = await session_repository.get_by_master_and_date(master.id, date_obj)
-    return sessions
+    sessions = await db.sessions.get_by_master_and_date(
+        principal.master_id, date_obj, include_history=include_history, fields=fields
+    )
+    return json_list(SessionInDB, sessions, fields=fields)
 
 
 @router.get("/appointments", response_model=List[AppointmentInDB])
 async def get_master_appointments(
-    current_user: UserInDB = Depends(get_current_user),
-    appointment_repository: AppointmentRepository = Depends(lambda: AppointmentRepository(next(get_db())))
+    include_history: bool = False,
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(AppointmentInDB)),
+    principal: Principal = Depends(get_current_principal),
+    db: DBManager = Depends(get_db_manager)
 ):
-    master_repository = MasterRepository(next(get_db()))
-    master = await master_repository.get_by_user_id(current_user.id)
-    
-    if not master:
+    if principal.master_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Master profile not found"
         )
     
-    appointments = await appointment_repository.get_by_master_id(master.id)
-    return appointments
+    appointments = await db.appointments.get_by_master_id(
+        principal.master_id, include_history=include_history, fields=fields
+    )
+    return json_list(AppointmentInDB, appointments, fields=fields)
 
 
 @router.put("/sessions/{session_id}/availability")
 async def update_session_availability(
     session_id: int,
     session_update: SessionUpdate,
-    current_user: UserInDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    principal: Principal = Depends(get_current_principal),
+    db: DBManager = Depends(get_db_manager),
+    writer: WriteQueue = Depends(get_write_queue)
 ):
-    session_repository = SessionRepository(db)
-    session = await session_repository.get_by_id(session_id)
+    session = await db.sessions.get_by_id(session_id)
     
     if not session:
         raise HTTPException(
@@ -103,15 +96,12 @@ async def update_session_availability(
         )
     
     # Verify that the session belongs to the current master
-    master_repository = MasterRepository(db)
-    master = await master_repository.get_by_user_id(current_user.id)
-    
-    if not master or session.master_id != master.id:
+    if principal.master_id is None or session.master_id != principal.master_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to update this session"
         )
     
     # Update session availability
-    updated_session = await session_repository.update(session_id, session_update)
+    updated_session = await writer.submit(lambda db: db.sessions.update(session_id, session_update))
     return updated_session
\ No newline at end of file
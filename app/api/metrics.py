@@ -0,0 +1,66 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+from app.database.database import engine, read_engine
+from app.database.writer import write_queue
+from app.services.auth import password_pool
+from app.utils.metrics import registry
+
+
+router = APIRouter(tags=["metrics"])
+
+pools = {"writer": engine, "reader": read_engine}
+
+pool_checkouts = registry.counter(
+    "db_pool_checkouts_total", "Connections handed out by the pool.", ("pool",)
+)
+for pool_name in pools:
+    event.listen(
+        pools[pool_name].sync_engine, "checkout",
+        lambda *args, pool_name=pool_name: pool_checkouts.inc(pool_name),
+    )
+
+
+def _pool_gauge(method: str):
+    return lambda: [
+        ((name,), getattr(target.pool, method)())
+        for name, target in pools.items()
+    ]
+
+
+registry.gauge_callback("db_pool_size", "Connections the pool keeps open.", ("pool",), _pool_gauge("size"))
+registry.gauge_callback(
+    "db_pool_checked_out", "Connections currently in use.", ("pool",), _pool_gauge("checkedout")
+)
+registry.gauge_callback("db_pool_overflow", "Connections opened beyond the pool size.", ("pool",), _pool_gauge("overflow"))
+
+registry.gauge_callback(
+    "db_write_queue_length", "Write jobs waiting for the writer.", (),
+    lambda: [((), write_queue.queue_length)],
+)
+registry.counter_callback(
+    "db_write_jobs_total", "Write jobs by outcome.", ("outcome",),
+    lambda: [(("processed",), write_queue.processed), (("failed",), write_queue.failed)],
+)
+registry.counter_callback(
+    "db_write_retries_total", "Write jobs retried after SQLITE_BUSY.", (),
+    lambda: [((), write_queue.retries)],
+)
+registry.counter_callback(
+    "db_write_commits_total", "Commits made by the writer.", (),
+    lambda: [((), write_queue.commits)],
+)
+
+registry.gauge_callback(
+    "password_hashing_queue_depth", "bcrypt jobs waiting for a worker.", (),
+    lambda: [((), password_pool.queue_depth)],
+)
+registry.counter_callback(
+    "password_hashing_rejected_total", "bcrypt jobs turned away because the queue was full.", (),
+    lambda: [((), password_pool.rejected)],
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,30 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.database.database import async_session_maker
-from app.repositories.review import ReviewRepository
-from app.repositories.appointment import AppointmentRepository
+from typing import List, Optional, Tuple
+from app.database.db_manager import DBManager
+from app.database.writer import WriteQueue
 from app.schemes.review import ReviewCreate, ReviewUpdate, ReviewInDB
-from app.schemes.user import UserInDB
-from app.dependencies import get_current_user
+from app.schemes.user import UserInDB, UserClaims
+from app.dependencies import get_current_user, get_current_claims, get_db_manager, get_write_queue, sparse_fields
+from app.utils.serialization import json_list, json_object
 
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
 
-async def get_db():
-    async with async_session_maker() as session:
-        yield session
-
-
 @router.post("/", response_model=ReviewInDB)
 async def create_review(
     review: ReviewCreate,
     current_user: UserInDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: DBManager = Depends(get_db_manager),
+    writer: WriteQueue = Depends(get_write_queue)
 ):
-    review_repository = ReviewRepository(db)
-    
     # Ensure the client can only create reviews for themselves
     if review.client_id != current_user.id:
         raise HTTPException(
@@ -33,8 +26,7 @@ async def create_review(
         )
     
     # Verify that the appointment belongs to the current user
-    appointment_repository = AppointmentRepository(db)
-    appointment = await appointment_repository.get_by_id(review.appointment_id)
+    appointment = await db.appointments.get_by_id(review.appointment_id)
     
     if not appointment or appointment.client_id != current_user.id:
         raise HTTPException(
@@ -42,17 +34,19 @@ async def create_review(
             detail="Cannot create review for an appointment that doesn't belong to you"
         )
     
-    db_review = await review_repository.create(review)
+    db_review = await writer.submit(lambda db: db.reviews.create(review))
     return db_review
 
 
 @router.get("/{review_id}", response_model=ReviewInDB)
 async def get_review(
     review_id: int,
-    current_user: UserInDB = Depends(get_current_user),
-    review_repository: ReviewRepository = Depends(lambda: ReviewRepository(next(get_db())))
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(ReviewInDB)),
+    current_user: UserClaims = Depends(get_current_claims),
+    db: DBManager = Depends(get_db_manager)
 ):
-    review = await review_repository.get_by_id(review_id)
+    # client_id is always loaded for the permission check below
+    review = await db.reviews.get_by_id(review_id, fields=fields and fields + ("client_id",))
     
     if not review:
         raise HTTPException(
@@ -67,7 +61,7 @@ async def get_review(
             detail="Not authorized to view this review"
         )
     
-    return review
+    return json_object(ReviewInDB, review, fields=fields)
 
 
 @router.put("/{review_id}", response_model=ReviewInDB)
@@ -75,10 +69,10 @@ async def update_review(
     review_id: int,
     review_update: ReviewUpdate,
     current_user: UserInDB = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: DBManager = Depends(get_db_manager),
+    writer: WriteQueue = Depends(get_write_queue)
 ):
-    review_repository = ReviewRepository(db)
-    review = await review_repository.get_by_id(review_id)
+    review = await db.reviews.get_by_id(review_id)
     
     if not review:
         raise HTTPException(
@@ -93,7 +87,13 @@ async def update_review(
             detail="Not authorized to update this review"
         )
     
-    updated_review = await review_repository.update(review_id, review_update)
+    updated_review = await writer.submit(lambda db: db.reviews.update(review_id, review_update))
+    if not updated_review:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Review not found"
+        )
+    
     return updated_review
 
 
@@ -101,9 +101,10 @@ async def update_review(
 async def delete_review(
     review_id: int,
     current_user: UserInDB = Depends(get_current_user),
-    review_repository: ReviewRepository = Depends(lambda: ReviewRepository(next(get_db())))
+    db: DBManager = Depends(get_db_manager),
+    writer: WriteQueue = Depends(get_write_queue)
 ):
-    review = await review_repository.get_by_id(review_id)
+    review = await db.reviews.get_by_id(review_id)
     
     if not review:
         raise HTTPException(
@@ -118,7 +119,7 @@ async def delete_review(
             detail="Not authorized to delete this review"
         )
     
-    success = await review_repository.delete(review_id)
+    success = await writer.submit(lambda db: db.reviews.delete(review_id))
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -133,12 +134,13 @@ async def get_reviews_by_master(
     master_id: int,
     skip: int = 0,
     limit: int = 100,
-    current_user: UserInDB = Depends(get_current_user),
-    review_repository: ReviewRepository = Depends(lambda: ReviewRepository(next(get_db())))
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(ReviewInDB)),
+    current_user: UserClaims = Depends(get_current_claims),
+    db: DBManager = Depends(get_db_manager)
 ):
     # Anyone can view reviews for a master
-    reviews = await review_repository.get_by_master_id(master_id)
-    return reviews
+    reviews = await db.reviews.get_by_master_id(master_id, fields=fields)
+    return json_list(ReviewInDB, reviews, fields=fields)
 
 
 @router.get("/client/{client_id}", response_model=List[ReviewInDB])
@@ -146,8 +148,9 @@ async def get_reviews_by_client(
     client_id: int,
     skip: int = 0,
     limit: int = 100,
-    current_user: UserInDB = Depends(get_current_user),
-    review_repository: ReviewRepository = Depends(lambda: ReviewRepository(next(get_db())))
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(ReviewInDB)),
+    current_user: UserClaims = Depends(get_current_claims),
+    db: DBManager = Depends(get_db_manager)
 ):
     # Only allow the client themselves or an admin to view their reviews
     if current_user.id != client_id and current_user.role != "admin":
@@ -156,5 +159,5 @@ async def get_reviews_by_client(
             detail="Not authorized to view these reviews"
         )
     
-    reviews = await review_repository.get_by_client_id(client_id)
-    return reviews
\ No newline at end of file
+    reviews = await db.reviews.get_by_client_id(client_id, fields=fields)
+    return json_list(ReviewInDB, reviews, fields=fields)
\ No newline at end of file
@@ -2,36 +2,27 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, extract
 from datetime import datetime, timedelta
-from app.database.database import async_session_maker
-from app.repositories.appointment import AppointmentRepository
-from app.repositories.service import ServiceRepository
-from app.repositories.master import MasterRepository
-from app.repositories.user import UserRepository
-from app.schemes.user import UserInDB
-from app.dependencies import get_current_user
+from app.database.db_manager import DBManager
+from app.schemes.user import UserClaims
+from app.dependencies import get_current_claims, get_db_manager
 
 
 router = APIRouter(prefix="/statistics", tags=["statistics"])
 
 
-async def get_db():
-    async with async_session_maker() as session:
-        yield session
-
-
 @router.get("/dashboard")
-async def get_dashboard_stats(current_user: UserInDB = Depends(get_current_user)):
+async def get_dashboard_stats(
+    current_user: UserClaims = Depends(get_current_claims),
+    db: DBManager = Depends(get_db_manager)
+):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access statistics"
         )
     
-    db = next(get_db())
-    
     # Total appointments
-    appointment_repository = AppointmentRepository(db)
-    all_appointments = await appointment_repository.get_all(skip=0, limit=10000)
+    all_appointments = await db.appointments.get_all(skip=0, limit=10000)
     total_appointments = len(all_appointments)
     
     # Completed appointments
@@ -42,18 +33,15 @@ async def get_dashboard_stats(current_user: UserInDB = Depends(get_current_user)
     total_revenue = completed_appointments * 1500  # Placeholder value
     
     # Total customers
-    user_repository = UserRepository(db)
-    all_users = await user_repository.get_all(skip=0, limit=1000)
+    all_users = await db.users.get_all(skip=0, limit=1000)
     total_customers = len([user for user in all_users if user.role == "client"])
     
     # Total masters
-    master_repository = MasterRepository(db)
-    all_masters = await master_repository.get_all(skip=0, limit=1000)
+    all_masters = await db.masters.get_all(skip=0, limit=1000)
     total_masters = len(all_masters)
     
     # Top services (placeholder implementation)
-    service_repository = ServiceRepository(db)
-    all_services = await service_repository.get_all(skip=0, limit=1000)
+    all_services = await db.services.get_all(skip=0, limit=1000)
     top_services = [{"name": service.name, "count": 10} for service in all_services[:5]]  # Placeholder
     
     return {
@@ -69,7 +57,8 @@ async def get_dashboard_stats(current_user: UserInDB = Depends(get_current_user)
 @router.get("/revenue")
 async def get_revenue_stats(
     period: str = "month",  # Options: day, week, month, year
-    current_user: UserInDB = Depends(get_current_user)
+    current_user: UserClaims = Depends(get_current_claims),
+    db: DBManager = Depends(get_db_manager)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -77,9 +66,7 @@ async def get_revenue_stats(
             detail="Not authorized to access revenue statistics"
         )
     
-    db = next(get_db())
-    appointment_repository = AppointmentRepository(db)
-    all_appointments = await appointment_repository.get_all(skip=0, limit=10000)
+    all_appointments = await db.appointments.get_all(skip=0, limit=10000)
     
     # Filter for completed appointments only
     completed_appointments = [appt for appt in all_appointments if appt.status == "completed"]
@@ -117,16 +104,17 @@ async def get_revenue_stats(
 
 
 @router.get("/appointments")
-async def get_appointment_stats(current_user: UserInDB = Depends(get_current_user)):
+async def get_appointment_stats(
+    current_user: UserClaims = Depends(get_current_claims),
+    db: DBManager = Depends(get_db_manager)
+):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access appointment statistics"
         )
     
-    db = next(get_db())
-    appointment_repository = AppointmentRepository(db)
-    all_appointments = await appointment_repository.get_all(skip=0, limit=10000)
+    all_appointments = await db.appointments.get_all(skip=0, limit=10000)
     
     total_appointments = len(all_appointments)
     completed_appointments = len([appt for appt in all_appointments if appt.status == "completed"])
@@ -1,54 +1,129 @@
+import asyncio
+import os
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
 from fastapi import APIRouter, Request, Depends
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
+from markupsafe import Markup
+from app.config import settings
+from app.database.database import read_session_maker
+from app.database.db_manager import DBManager
 from app.dependencies import get_current_user
 from app.schemes.user import UserInDB
+from app.utils.fragment_cache import fragment_cache
+from app.utils.static_assets import static_url
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+
+
+@lru_cache(maxsize=None)
+def get_templates():
+    # Jinja2 takes ~30 ms to import, so the environment is built by the
+    # first page request rather than at startup.
+    from fastapi.templating import Jinja2Templates
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+    bytecode_cache = None
+    if settings.TEMPLATE_BYTECODE_CACHE_DIR:
+        os.makedirs(settings.TEMPLATE_BYTECODE_CACHE_DIR, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(settings.TEMPLATE_BYTECODE_CACHE_DIR)
+    env = Environment(
+        loader=FileSystemLoader("templates"),
+        autoescape=True,
+        auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+        bytecode_cache=bytecode_cache,
+    )
+    env.globals["static_url"] = static_url
+    return Jinja2Templates(env=env)
+
+
+async def _read(fetch: Callable[[DBManager], Awaitable[Any]]) -> Any:
+    # Pages fetch concurrently, and one session cannot run two queries at
+    # once, so every fetch gets a read session of its own.
+    async with DBManager(read_session_maker) as db:
+        result = await fetch(db)
+        # Leaving the session rolls back, which would expire the rows
+        # before the template reads them; detached they keep what was loaded.
+        db.session.expunge_all()
+        return result
+
+
+async def _catalog_fragment(template: str, table: str) -> Markup:
+    # "services" or "masters": the table, its repository and the template variable
+    async def render() -> str:
+        rows = await _read(lambda db: getattr(db, table).get_all())
+        return get_templates().get_template(template).render(**{table: rows})
+
+    return await fragment_cache.get(template, (table,), render)
 
 
 @router.get("/", response_class=HTMLResponse)
 async def home(request: Request, current_user: UserInDB = Depends(get_current_user)):
-    return templates.TemplateResponse("index.html", {"request": request, "current_user": current_user})
+    return get_templates().TemplateResponse("index.html", {"request": request, "current_user": current_user})
 
 
 @router.get("/services", response_class=HTMLResponse)
 async def services(request: Request, current_user: UserInDB = Depends(get_current_user)):
-    return templates.TemplateResponse("services.html", {"request": request, "current_user": current_user})
+    service_rows = await _catalog_fragment("fragments/service_rows.html", "services")
+    return get_templates().TemplateResponse(
+        "services.html", {"request": request, "current_user": current_user, "service_rows": service_rows}
+    )
 
 
 @router.get("/masters", response_class=HTMLResponse)
 async def masters(request: Request, current_user: UserInDB = Depends(get_current_user)):
-    return templates.TemplateResponse("masters.html", {"request": request, "current_user": current_user})
+    master_cards, reviews = await asyncio.gather(
+        _catalog_fragment("fragments/master_cards.html", "masters"),
+        _read(lambda db: db.reviews.get_recent()),
+    )
+    return get_templates().TemplateResponse("masters.html", {
+        "request": request,
+        "current_user": current_user,
+        "master_cards": master_cards,
+        "reviews": reviews,
+    })
 
 
 @router.get("/booking", response_class=HTMLResponse)
 async def booking(request: Request, current_user: UserInDB = Depends(get_current_user)):
-    return templates.TemplateResponse("booking.html", {"request": request, "current_user": current_user})
+    service_options, master_options, appointments = await asyncio.gather(
+        _catalog_fragment("fragments/service_options.html", "services"),
+        _catalog_fragment("fragments/master_options.html", "masters"),
+        _read(lambda db: db.appointments.get_by_client_id(current_user.id)),
+    )
+    return get_templates().TemplateResponse("booking.html", {
+        "request": request,
+        "current_user": current_user,
+        "service_options": service_options,
+        "master_options": master_options,
+        "appointments": [appointment for appointment in appointments if appointment.status == "booked"],
+    })
 
 
 @router.get("/profile", response_class=HTMLResponse)
 async def profile(request: Request, current_user: UserInDB = Depends(get_current_user)):
-    return templates.TemplateResponse("profile.html", {"request": request, "current_user": current_user})
+    return get_templates().TemplateResponse("profile.html", {"request": request, "current_user": current_user})
 
 
 @router.get("/my-appointments", response_class=HTMLResponse)
 async def my_appointments(request: Request, current_user: UserInDB = Depends(get_current_user)):
-    return templates.TemplateResponse("my-appointments.html", {"request": request, "current_user": current_user})
+    appointments = await _read(lambda db: db.appointments.get_by_client_id(current_user.id))
+    return get_templates().TemplateResponse(
+        "my-appointments.html", {"request": request, "current_user": current_user, "appointments": appointments}
+    )
 
 
 @router.get("/master-schedule", response_class=HTMLResponse)
 async def master_schedule(request: Request, current_user: UserInDB = Depends(get_current_user)):
-    return templates.TemplateResponse("master-schedule.html", {"request": request, "current_user": current_user})
+    return get_templates().TemplateResponse("master-schedule.html", {"request": request, "current_user": current_user})
 
 
 @router.get("/master-appointments", response_class=HTMLResponse)
 async def master_appointments(request: Request, current_user: UserInDB = Depends(get_current_user)):
-    return templates.TemplateResponse("master-appointments.html", {"request": request, "current_user": current_user})
+    return get_templates().TemplateResponse("master-appointments.html", {"request": request, "current_user": current_user})
 
 
 @router.get("/admin", response_class=HTMLResponse)
 async def admin_dashboard(request: Request, current_user: UserInDB = Depends(get_current_user)):
-    return templates.TemplateResponse("admin-dashboard.html", {"request": request, "current_user": current_user})
\ No newline at end of file
+    return get_templates().TemplateResponse("admin-dashboard.html", {"request": request, "current_user": current_user})
\ No newline at end of file
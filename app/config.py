@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -6,9 +7,130 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str
     JWT_SECRET_KEY: str
 
+    # Connection PRAGMAs: a named profile from app/database/pragmas.py
+    # ("durable", "balanced", "fast"); the SQLITE_* values override it.
+    SQLITE_PRAGMA_PROFILE: str = "durable"
+    SQLITE_JOURNAL_MODE: Optional[str] = None
+    SQLITE_SYNCHRONOUS: Optional[str] = None
+    SQLITE_CACHE_SIZE: Optional[int] = None
+    SQLITE_MMAP_SIZE: Optional[int] = None
+    SQLITE_TEMP_STORE: Optional[str] = None
+    SQLITE_BUSY_TIMEOUT_MS: Optional[int] = None
+
+    # Startup compares the database with the Alembic heads: "error" refuses
+    # to start on a mismatch, "warn" only logs, "off" skips the check.
+    DB_SCHEMA_CHECK: str = "error"
+
+    DB_READ_POOL_SIZE: int = 5
+    DB_WRITE_MAX_RETRIES: int = 5
+    DB_WRITE_RETRY_BASE_DELAY_MS: int = 20
+    # Commit concurrent writes arriving within the window in one transaction
+    # (one fsync) instead of one transaction each.
+    DB_GROUP_COMMIT_ENABLED: bool = False
+    DB_GROUP_COMMIT_WINDOW_MS: int = 2
+    DB_GROUP_COMMIT_MAX_OPS: int = 50
+
+    # Background upkeep (app/database/maintenance.py). PRAGMA optimize and
+    # ANALYZE run every interval; the WAL checkpoint and incremental vacuum
+    # only inside the quiet hours ("HH:MM-HH:MM", local time, may wrap).
+    MAINTENANCE_ENABLED: bool = True
+    MAINTENANCE_INTERVAL_MINUTES: int = 60
+    MAINTENANCE_QUIET_HOURS: str = "02:00-05:00"
+    MAINTENANCE_OPTIMIZE_BUDGET_MS: int = 500
+    MAINTENANCE_ANALYZE_BUDGET_MS: int = 2000
+    # ANALYZE a table once this share of its rows has changed
+    MAINTENANCE_ANALYZE_CHANGE_RATIO: float = 0.1
+    MAINTENANCE_ANALYSIS_LIMIT: int = 1000
+    MAINTENANCE_CHECKPOINT_BUDGET_MS: int = 5000
+    MAINTENANCE_VACUUM_BUDGET_MS: int = 5000
+    MAINTENANCE_VACUUM_STEP_PAGES: int = 1000
+    # Databases created before incremental vacuum need one full VACUUM
+    MAINTENANCE_CONVERT_AUTO_VACUUM: bool = False
+
+    # Online backups (app/database/backup.py). Scheduled ones run inside the
+    # maintenance quiet hours once the newest backup is older than the
+    # interval; 0 leaves only the admin endpoint and the CLI.
+    BACKUP_DIR: str = "backups"
+    BACKUP_RETENTION: int = 7
+    BACKUP_INTERVAL_HOURS: int = 24
+    BACKUP_PAGES_PER_STEP: int = 1000
+    BACKUP_STEP_SLEEP_MS: int = 10
+    BACKUP_BUDGET_SECONDS: int = 600
+
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Let read-only endpoints authorize from verified token claims without
+    # loading the user. Revocations are tracked per process, so only enable
+    # this when every worker sees user changes (single process deployments).
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Catalog responses carry ETags (app/utils/table_versions.py); within
+    # max-age clients reuse them without asking, after that they revalidate
+    # and get a 304 while nothing changed. Services change rarely, masters
+    # are edited by the masters themselves.
+    SERVICES_CACHE_CONTROL: str = "public, max-age=300"
+    MASTERS_CACHE_CONTROL: str = "public, max-age=60"
+
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    # Dynamic responses of at least COMPRESSION_MIN_SIZE bytes; br needs the
+    # optional brotli package, gzip is always available
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Served at /static; `python -m app.utils.static_assets` builds the
+    # fingerprinted copies into <STATIC_DIR>/dist
+    STATIC_DIR: str = "static"
+
+    # Compiled templates are kept on disk so a restart skips compiling them
+    # again; "" disables it. Without auto reload, edited templates are only
+    # picked up after a restart.
+    TEMPLATE_BYTECODE_CACHE_DIR: str = ".cache/jinja"
+    TEMPLATE_AUTO_RELOAD: bool = True
+
+    METRICS_ENABLED: bool = True
+    METRICS_EVENT_LOOP_INTERVAL_MS: int = 500
+
+    # Per-request statement counting (app/middleware.py)
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_STATS_HEADERS: bool = True
+    QUERY_BUDGET: int = 20
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5
+
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: int = 100
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_LOG_FILE: str = "logs/slow_queries.log"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 5 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 3
+    SLOW_QUERY_RECENT: int = 200
+
+    BULK_IMPORT_MAX_ROWS: int = 10000
+    BULK_IMPORT_CHUNK_SIZE: int = 500
+
+    # Finished appointments and past sessions older than this move to the
+    # *_archive tables (app/services/archive_service.py)
+    ARCHIVE_HORIZON_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 500
+
+    # Rates are "<count>/<second|minute|hour|day>", an empty string disables one
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_LOGIN_PER_IP: str = "20/minute"
+    RATE_LIMIT_LOGIN_PER_USER: str = "5/minute"
+    RATE_LIMIT_LOGIN_PER_ROUTE: str = "20/second"
+    RATE_LIMIT_BOOKING_PER_IP: str = "30/minute"
+    RATE_LIMIT_BOOKING_PER_USER: str = "10/minute"
+    RATE_LIMIT_BOOKING_PER_ROUTE: str = "50/second"
+
     @property
     def get_db_url(self):
-        return f"aiosqlite//{self.DB_NAME}"
+        return f"sqlite+aiosqlite:///{self.DB_NAME}"
 
     @property
     def auth_data(self):
@@ -0,0 +1,40 @@
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+_CALLBACKS = "after_commit_callbacks"
+
+
+def after_commit(session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's transaction commits.
+
+    Repositories only flush, so side effects outside the database (cache
+    invalidation, token revocation) wait for the commit; otherwise another
+    request could cache the old row again before the new one is visible.
+    Callbacks are dropped when the transaction rolls back; a savepoint
+    rolling back keeps them.
+    """
+    # Accepts the AsyncSession the repositories hold
+    sync_session = getattr(session, "sync_session", session)
+    sync_session.info.setdefault(_CALLBACKS, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_callbacks(session: Session) -> None:
+    # Releasing a savepoint sends after_commit too; wait for the real commit
+    if session.in_nested_transaction():
+        return
+    for callback in session.info.pop(_CALLBACKS, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_callbacks(session: Session, transaction: SessionTransaction) -> None:
+    # after_rollback also fires for savepoints, where dropping everything
+    # would lose the callbacks of the work that is still going to commit
+    # (group commit runs every job in a savepoint). Callbacks queued inside
+    # a rolled back savepoint stay and only invalidate a cache entry too
+    # many. After a commit the list is already gone.
+    if transaction.parent is None:
+        session.info.pop(_CALLBACKS, None)
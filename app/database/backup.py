@@ -0,0 +1,253 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.database.schema_version import migration_heads
+
+logger = logging.getLogger("app.backup")
+
+CHECKSUM_SUFFIX = ".sha256"
+
+
+class BackupError(Exception):
+    pass
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_checksum(path: Path) -> Optional[str]:
+    sidecar = path.with_name(path.name + CHECKSUM_SUFFIX)
+    if not sidecar.exists():
+        return None
+    return sidecar.read_text().split()[0]
+
+
+def verify_backup(path: Path) -> Dict[str, Any]:
+    """Open a backup read-only and check that it could be restored.
+
+    Compares the checksum with the sidecar file, runs integrity_check and
+    foreign_key_check and compares the schema revision with the
+    migrations. The source database is never touched.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise BackupError(f"{path} does not exist")
+    report: Dict[str, Any] = {"backup": path.name}
+
+    expected_checksum = read_checksum(path)
+    report["checksum_ok"] = expected_checksum is not None and file_sha256(path) == expected_checksum
+
+    connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        integrity = [row[0] for row in connection.execute("PRAGMA integrity_check")]
+        report["integrity"] = integrity if integrity != ["ok"] else "ok"
+        report["foreign_key_violations"] = len(connection.execute("PRAGMA foreign_key_check").fetchall())
+        try:
+            revisions = {row[0] for row in connection.execute("SELECT version_num FROM alembic_version")}
+        except sqlite3.OperationalError:
+            revisions = set()
+        report["schema_revision"] = sorted(revisions)
+        report["schema_current"] = revisions == migration_heads()
+        tables = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )]
+        report["rows"] = {
+            table: connection.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0] for table in tables
+        }
+    finally:
+        connection.close()
+
+    report["ok"] = (
+        report["checksum_ok"] and report["integrity"] == "ok" and report["foreign_key_violations"] == 0
+    )
+    return report
+
+
+class BackupManager:
+    """Hot backups of the database file into ``directory``.
+
+    Uses SQLite's online backup API from a separate read-only connection
+    that holds one read transaction for the whole copy. In WAL mode that
+    pins a consistent snapshot: bookings keep committing, and the backup
+    does not restart every time they do, which it would without the open
+    transaction. Pages are copied in batches with a pause after each one
+    to leave disk bandwidth for the app.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        directory: str,
+        retention: int,
+        pages_per_step: int,
+        step_sleep: float,
+        interval: float,
+    ):
+        self.database = database
+        self.directory = Path(directory)
+        self.retention = retention
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.interval = interval
+        self._lock = asyncio.Lock()
+
+    @property
+    def prefix(self) -> str:
+        return Path(self.database).stem
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        if not self.directory.exists():
+            return []
+        backups = []
+        for path in sorted(self.directory.glob(f"{self.prefix}-*.db"), reverse=True):
+            stat = path.stat()
+            backups.append({
+                "name": path.name,
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds"),
+                "sha256": read_checksum(path),
+            })
+        return backups
+
+    def path_of(self, name: str) -> Path:
+        path = self.directory / name
+        # Names come from the admin API; only files in the backup directory
+        if path.parent != self.directory or not path.name.startswith(f"{self.prefix}-"):
+            raise BackupError(f"Unknown backup {name}")
+        return path
+
+    async def create(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        if self.database == ":memory:":
+            raise BackupError("An in-memory database cannot be backed up")
+        if self._lock.locked():
+            raise BackupError("A backup is already running")
+        async with self._lock:
+            return await asyncio.to_thread(self._create, deadline)
+
+    def _create(self, deadline: Optional[float]) -> Dict[str, Any]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"{self.prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.db"
+        path = self.directory / name
+        partial = path.with_name(name + ".partial")
+        started = time.perf_counter()
+        steps = 0
+
+        def progress(status, remaining, total):
+            nonlocal steps
+            steps += 1
+            if deadline is not None and time.perf_counter() > deadline:
+                # An exception from the callback aborts the backup
+                raise BackupError(f"Backup stopped at the time budget with {remaining} of {total} pages left")
+            if remaining:
+                time.sleep(self.step_sleep)
+
+        source = sqlite3.connect(f"{Path(self.database).resolve().as_uri()}?mode=ro", uri=True, isolation_level=None)
+        target = sqlite3.connect(partial, isolation_level=None)
+        try:
+            source.execute("BEGIN")
+            source.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            source.backup(target, pages=self.pages_per_step, progress=progress)
+            source.execute("COMMIT")
+            # The copy inherits WAL mode; a backup should be one self-contained file
+            target.execute("PRAGMA journal_mode = DELETE")
+        except BaseException:
+            target.close()
+            partial.unlink(missing_ok=True)
+            raise
+        finally:
+            source.close()
+        target.close()
+
+        checksum = file_sha256(partial)
+        partial.replace(path)
+        path.with_name(name + CHECKSUM_SUFFIX).write_text(f"{checksum}  {name}\n")
+        removed = self._rotate()
+
+        result = {
+            "name": name,
+            "size": path.stat().st_size,
+            "sha256": checksum,
+            "steps": steps,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "removed": removed,
+        }
+        logger.info("Backup %s written in %.1f ms (%d steps)", name, result["duration_ms"], steps)
+        return result
+
+    def _rotate(self) -> List[str]:
+        removed = []
+        for backup in self.list_backups()[self.retention:]:
+            path = self.directory / backup["name"]
+            path.unlink(missing_ok=True)
+            path.with_name(path.name + CHECKSUM_SUFFIX).unlink(missing_ok=True)
+            removed.append(backup["name"])
+        return removed
+
+    async def verify(self, name: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(verify_backup, self.path_of(name))
+
+    async def scheduled(self, deadline: float) -> str:
+        """Maintenance task: back up once the newest backup is ``interval`` old."""
+        backups = self.list_backups()
+        if backups:
+            age = datetime.now() - datetime.fromisoformat(backups[0]["created_at"])
+            if age < timedelta(seconds=self.interval):
+                return f"skipped: last backup is {int(age.total_seconds() // 60)} minutes old"
+        result = await self.create(deadline)
+        return f"wrote {result['name']} ({result['size']} bytes) in {result['duration_ms']} ms"
+
+
+backup_manager = BackupManager(
+    settings.DB_NAME,
+    directory=settings.BACKUP_DIR,
+    retention=settings.BACKUP_RETENTION,
+    pages_per_step=settings.BACKUP_PAGES_PER_STEP,
+    step_sleep=settings.BACKUP_STEP_SLEEP_MS / 1000,
+    interval=settings.BACKUP_INTERVAL_HOURS * 3600,
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Create or verify database backups.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("create", help="write a backup now")
+    commands.add_parser("list", help="list backups, newest first")
+    verify = commands.add_parser("verify", help="open a backup and run integrity checks")
+    verify.add_argument("path", help="backup file, or a name in BACKUP_DIR")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "create":
+            print(json.dumps(asyncio.run(backup_manager.create()), indent=2))
+        elif args.command == "list":
+            print(json.dumps(backup_manager.list_backups(), indent=2))
+        else:
+            path = Path(args.path)
+            if not path.exists():
+                path = backup_manager.path_of(args.path)
+            report = verify_backup(path)
+            print(json.dumps(report, indent=2))
+            return 0 if report["ok"] else 1
+    except BackupError as error:
+        print(error, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,86 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from functools import partial
+from typing import Any, Dict, TYPE_CHECKING
 
-from sqlalchemy import NullPool, func, text
+from sqlalchemy import event, func, text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from app.config import settings
+from app.database.pragmas import apply_pragmas, resolve_pragmas
+from app.database.query_stats import instrument_engine
+from app.database.slow_queries import SlowQueryLog
 
-engine = create_async_engine(settings.get_db_url)
 
-engine_null_pool = create_async_engine(settings.get_db_url, poolclass=NullPool)
+slow_query_log = SlowQueryLog(
+    threshold=settings.SLOW_QUERY_THRESHOLD_MS / 1000,
+    path=settings.SLOW_QUERY_LOG_FILE,
+    max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+    backups=settings.SLOW_QUERY_LOG_BACKUPS,
+    keep=settings.SLOW_QUERY_RECENT,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
+
+
+def create_sqlite_engine(url: str, pragmas: Dict[str, Any], **kwargs) -> AsyncEngine:
+    engine = create_async_engine(url, **kwargs)
+    event.listen(engine.sync_engine, "connect", partial(apply_pragmas, pragmas=pragmas))
+    instrument_engine(engine)
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        slow_query_log.install(engine)
+    return engine
+
+
+def use_explicit_transactions(engine: AsyncEngine, begin: str = "BEGIN") -> None:
+    # pysqlite opens transactions lazily on the first DML statement, so a
+    # SAVEPOINT issued first becomes the outermost transaction and RELEASE
+    # commits it. Disable that and emit BEGIN ourselves.
+    @event.listens_for(engine.sync_engine, "connect")
+    def disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql(begin)
+
+
+# SQLite has a single writer, so writes go through one connection owned by
+# the write queue (app/database/writer.py). Queries use a separate pool of
+# read-only connections that, in WAL mode, never wait for the writer.
+if settings.DB_NAME == ":memory:":
+    # A plain :memory: connection is a database of its own, so both pools
+    # open the same shared-cache one; it lives while any connection is open.
+    # Shared-cache connections lock tables instead of waiting on busy_timeout,
+    # hence readers skip the read locks (and may see uncommitted writes).
+    memory_url = "sqlite+aiosqlite:///file::memory:?cache=shared&uri=true"
+    engine = create_sqlite_engine(memory_url, resolve_pragmas(settings), pool_size=1, max_overflow=0)
+    read_engine = create_sqlite_engine(
+        memory_url,
+        {**resolve_pragmas(settings), "query_only": "ON", "read_uncommitted": "ON"},
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=0,
+    )
+else:
+    engine = create_sqlite_engine(
+        settings.get_db_url, resolve_pragmas(settings), pool_size=1, max_overflow=0
+    )
+    read_engine = create_sqlite_engine(
+        settings.get_db_url,
+        {**resolve_pragmas(settings), "query_only": "ON"},
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=0,
+    )
+# IMMEDIATE takes the write lock up front, so contention with other processes
+# shows up as a retryable busy error at BEGIN rather than mid-transaction.
+use_explicit_transactions(engine, "BEGIN IMMEDIATE")
 
 
 async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
-async_session_maker_null_pool = async_sessionmaker(
-    bind=engine_null_pool, expire_on_commit=False
-)
+read_session_maker = async_sessionmaker(bind=read_engine, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
@@ -1,15 +1,35 @@
-from app.database.database import async_session_maker
+from app.database.database import Base, async_session_maker, engine
+from app.repositories import (
+    UserRepository,
+    MasterRepository,
+    ServiceRepository,
+    SessionRepository,
+    AppointmentRepository,
+    ReviewRepository,
+    ShiftRepository,
+)
 
 
 class DBManager:
-    def __init__(self, session_factory: async_session_maker):
+    """Unit of work: every repository shares one session and one transaction.
+
+    Repositories only flush; nothing is persisted until ``commit()``.
+    Leaving the context without committing rolls the transaction back.
+    """
+
+    def __init__(self, session_factory=async_session_maker):
         self.session_factory = session_factory
 
     async def __aenter__(self):
         self.session = self.session_factory()
-        # TODO Добавить сюда созданные репозитории
-        # Пример:
-        # self.users = UsersRepository(self.session)
+        self.users = UserRepository(self.session)
+        self.masters = MasterRepository(self.session)
+        self.services = ServiceRepository(self.session)
+        self.sessions = SessionRepository(self.session)
+        self.appointments = AppointmentRepository(self.session)
+        self.reviews = ReviewRepository(self.session)
+        self.shifts = ShiftRepository(self.session)
+        return self
 
     async def __aexit__(self, *args):
         await self.session.rollback()
@@ -17,3 +37,10 @@ class DBManager:
 
     async def commit(self):
         await self.session.commit()
+
+
+async def create_all_tables():
+    import app.models  # noqa: F401 - registers the models on Base.metadata
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,295 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, time as time_of_day
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.database.backup import backup_manager
+from app.database.database import engine
+
+logger = logging.getLogger("app.maintenance")
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def parse_quiet_hours(value: str) -> Optional[Tuple[time_of_day, time_of_day]]:
+    """"02:00-05:00" -> (02:00, 05:00); the window may wrap past midnight."""
+    if not value:
+        return None
+    start, end = (time_of_day.fromisoformat(part.strip()) for part in value.split("-"))
+    return start, end
+
+
+def in_quiet_hours(window: Optional[Tuple[time_of_day, time_of_day]], now: datetime) -> bool:
+    if window is None:
+        return False
+    start, end = window
+    current = now.time()
+    if start <= end:
+        return start <= current < end
+    return current >= start or current < end
+
+
+@dataclass
+class MaintenanceTask:
+    name: str
+    run: Callable[[float], Awaitable[str]]  # deadline (perf_counter) -> summary
+    budget: float
+    # Tasks that hold the write lock for long or make readers wait
+    quiet_only: bool = False
+
+
+class MaintenanceScheduler:
+    """Keeps the database file healthy from inside the app.
+
+    Every ``interval`` seconds it runs PRAGMA optimize and ANALYZE on the
+    tables this process changed the most; inside the quiet hours it also
+    checkpoints the WAL and returns free pages to the filesystem. Tasks use
+    the writer's connection, so they queue with regular writes instead of
+    competing for the lock, and each one stops at its time budget.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        interval: float,
+        quiet_hours: str,
+        optimize_budget: float,
+        analyze_budget: float,
+        analyze_change_ratio: float,
+        analysis_limit: int,
+        checkpoint_budget: float,
+        vacuum_budget: float,
+        vacuum_step_pages: int,
+        convert_auto_vacuum: bool = False,
+    ):
+        self.engine = engine
+        self.interval = interval
+        self.quiet_hours = parse_quiet_hours(quiet_hours)
+        self.analyze_change_ratio = analyze_change_ratio
+        self.analysis_limit = analysis_limit
+        self.vacuum_step_pages = vacuum_step_pages
+        self.convert_auto_vacuum = convert_auto_vacuum
+        self.changed_rows: Counter = Counter()
+        self.runs: Deque[Dict[str, Any]] = deque(maxlen=50)
+        self.tasks: List[MaintenanceTask] = [
+            MaintenanceTask("optimize", self.optimize, optimize_budget),
+            MaintenanceTask("analyze", self.analyze_changed_tables, analyze_budget),
+            MaintenanceTask("wal_checkpoint", self.checkpoint, checkpoint_budget, quiet_only=True),
+            MaintenanceTask("incremental_vacuum", self.incremental_vacuum, vacuum_budget, quiet_only=True),
+        ]
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        event.listen(engine.sync_engine, "after_cursor_execute", self._count_changes)
+
+    def add_task(self, task: MaintenanceTask) -> None:
+        self.tasks.append(task)
+
+    def _count_changes(self, conn, cursor, statement, parameters, context, executemany):
+        if context is None or context.compiled is None:
+            return
+        if context.isinsert or context.isupdate or context.isdelete:
+            table = getattr(context.compiled.statement, "table", None)
+            if table is None:
+                return
+            if cursor.rowcount >= 0:
+                self.changed_rows[table.name] += cursor.rowcount
+            else:
+                # RETURNING statements report -1 until their rows are
+                # fetched; ours change one row per parameter set.
+                self.changed_rows[table.name] += len(parameters) if executemany else 1
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Maintenance run failed")
+
+    async def run_once(self, include_quiet: Optional[bool] = None) -> List[Dict[str, Any]]:
+        if include_quiet is None:
+            include_quiet = in_quiet_hours(self.quiet_hours, datetime.now())
+        results = []
+        async with self._lock:
+            for task in self.tasks:
+                if task.quiet_only and not include_quiet:
+                    continue
+                results.append(await self._run_task(task))
+        return results
+
+    async def _run_task(self, task: MaintenanceTask) -> Dict[str, Any]:
+        started_at = datetime.now()
+        started = time.perf_counter()
+        record = {"task": task.name, "started_at": started_at.isoformat(timespec="seconds")}
+        try:
+            record["result"] = await task.run(started + task.budget)
+            record["status"] = "ok"
+        except BudgetExceeded as error:
+            record["result"] = str(error)
+            record["status"] = "budget_exceeded"
+        except Exception as error:
+            if "interrupted" in str(error):
+                # The progress handler stopped the statement at the deadline
+                record["result"] = "interrupted at the time budget"
+                record["status"] = "budget_exceeded"
+            else:
+                record["result"] = f"{type(error).__name__}: {error}"
+                record["status"] = "failed"
+        record["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.runs.append(record)
+
+        log = logger.info if record["status"] == "ok" else logger.warning
+        log("%s %s in %.1f ms: %s", task.name, record["status"], record["duration_ms"], record["result"])
+        return record
+
+    @asynccontextmanager
+    async def _connection(self, deadline: Optional[float] = None) -> AsyncIterator[Any]:
+        # The raw aiosqlite connection of the writer pool. Statements run in
+        # autocommit mode, outside the BEGIN IMMEDIATE the ORM sessions use.
+        async with self.engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            connection = raw.driver_connection
+            if deadline is not None:
+                # Checked every 1000 VM steps; a non-zero return aborts
+                # the running statement with "interrupted".
+                await connection.set_progress_handler(lambda: time.perf_counter() > deadline, 1000)
+            try:
+                yield connection
+            finally:
+                if deadline is not None:
+                    await connection.set_progress_handler(None, 0)
+
+    @staticmethod
+    async def _fetch(connection, sql: str) -> List[tuple]:
+        cursor = await connection.execute(sql)
+        try:
+            return list(await cursor.fetchall())
+        finally:
+            await cursor.close()
+
+    async def optimize(self, deadline: float) -> str:
+        async with self._connection(deadline) as connection:
+            await self._fetch(connection, f"PRAGMA analysis_limit = {int(self.analysis_limit)}")
+            await self._fetch(connection, "PRAGMA optimize")
+        return "done"
+
+    async def analyze_changed_tables(self, deadline: float) -> str:
+        if not self.changed_rows:
+            return "no changes"
+        analyzed = []
+        async with self._connection(deadline) as connection:
+            await self._fetch(connection, f"PRAGMA analysis_limit = {int(self.analysis_limit)}")
+            try:
+                stat_rows = await self._fetch(connection, "SELECT tbl, stat FROM sqlite_stat1")
+            except Exception:
+                stat_rows = []  # never analyzed
+            # The first number of every sqlite_stat1 row is the table size
+            known_rows = {table: int(stat.split()[0]) for table, stat in stat_rows if stat}
+
+            for table, changes in self.changed_rows.most_common():
+                rows = known_rows.get(table)
+                if rows is not None and changes < rows * self.analyze_change_ratio:
+                    continue
+                if time.perf_counter() > deadline:
+                    raise BudgetExceeded(f"analyzed {', '.join(analyzed) or 'nothing'} before the budget ran out")
+                await self._fetch(connection, f'ANALYZE "{table}"')
+                analyzed.append(table)
+                del self.changed_rows[table]
+        return f"analyzed {', '.join(analyzed)}" if analyzed else "below the change threshold"
+
+    async def checkpoint(self, deadline: float) -> str:
+        async with self._connection() as connection:
+            # TRUNCATE waits for readers up to busy_timeout, so the budget
+            # is applied there rather than through the progress handler.
+            budget_ms = max(int((deadline - time.perf_counter()) * 1000), 0)
+            previous = (await self._fetch(connection, "PRAGMA busy_timeout"))[0][0]
+            await self._fetch(connection, f"PRAGMA busy_timeout = {budget_ms}")
+            try:
+                # TRUNCATE reports 0 pages once the WAL is reset, so the
+                # PASSIVE pass is what tells how much was copied back.
+                _, log_pages, checkpointed = (await self._fetch(connection, "PRAGMA wal_checkpoint(PASSIVE)"))[0]
+                busy = (await self._fetch(connection, "PRAGMA wal_checkpoint(TRUNCATE)"))[0][0]
+            finally:
+                await self._fetch(connection, f"PRAGMA busy_timeout = {int(previous)}")
+        if busy:
+            raise BudgetExceeded(f"readers kept the WAL busy; checkpointed {checkpointed} of {log_pages} pages")
+        return f"checkpointed {checkpointed} of {log_pages} pages, WAL truncated"
+
+    async def incremental_vacuum(self, deadline: float) -> str:
+        async with self._connection() as connection:
+            mode = (await self._fetch(connection, "PRAGMA auto_vacuum"))[0][0]
+            free_pages = (await self._fetch(connection, "PRAGMA freelist_count"))[0][0]
+        if mode != 2:  # INCREMENTAL
+            if not self.convert_auto_vacuum:
+                return f"skipped: auto_vacuum is {mode}, not INCREMENTAL; {free_pages} free pages"
+            # Switching an existing file needs one full VACUUM
+            async with self._connection() as connection:
+                await self._fetch(connection, "PRAGMA auto_vacuum = INCREMENTAL")
+                await self._fetch(connection, "VACUUM")
+            return f"converted to auto_vacuum=INCREMENTAL with a full VACUUM; {free_pages} free pages released"
+
+        released = 0
+        while free_pages and time.perf_counter() < deadline:
+            # One short step at a time, giving queued writes the connection
+            # in between
+            async with self._connection() as connection:
+                # The pragma frees one page per step and the sqlite3 module
+                # only steps once in execute(); executescript runs it through.
+                await connection.executescript(f"PRAGMA incremental_vacuum({int(self.vacuum_step_pages)})")
+                remaining = (await self._fetch(connection, "PRAGMA freelist_count"))[0][0]
+            released += free_pages - remaining
+            free_pages = remaining
+        if free_pages:
+            raise BudgetExceeded(f"released {released} pages, {free_pages} still free")
+        return f"released {released} pages"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "interval_s": self.interval,
+            "quiet_hours": [part.isoformat("minutes") for part in self.quiet_hours] if self.quiet_hours else None,
+            "changed_rows": dict(self.changed_rows),
+            "recent_runs": list(reversed(self.runs))[:20],
+        }
+
+
+maintenance = MaintenanceScheduler(
+    engine,
+    interval=settings.MAINTENANCE_INTERVAL_MINUTES * 60,
+    quiet_hours=settings.MAINTENANCE_QUIET_HOURS,
+    optimize_budget=settings.MAINTENANCE_OPTIMIZE_BUDGET_MS / 1000,
+    analyze_budget=settings.MAINTENANCE_ANALYZE_BUDGET_MS / 1000,
+    analyze_change_ratio=settings.MAINTENANCE_ANALYZE_CHANGE_RATIO,
+    analysis_limit=settings.MAINTENANCE_ANALYSIS_LIMIT,
+    checkpoint_budget=settings.MAINTENANCE_CHECKPOINT_BUDGET_MS / 1000,
+    vacuum_budget=settings.MAINTENANCE_VACUUM_BUDGET_MS / 1000,
+    vacuum_step_pages=settings.MAINTENANCE_VACUUM_STEP_PAGES,
+    convert_auto_vacuum=settings.MAINTENANCE_CONVERT_AUTO_VACUUM,
+)
+if settings.BACKUP_INTERVAL_HOURS and settings.DB_NAME != ":memory:":
+    maintenance.add_task(MaintenanceTask(
+        "backup", backup_manager.scheduled, settings.BACKUP_BUDGET_SECONDS, quiet_only=True
+    ))
@@ -0,0 +1,64 @@
+from typing import Any, Dict
+
+
+# Values are applied in this order on every new connection.
+PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Survives power loss: every commit is fsynced to the WAL.
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,  # KiB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,  # ms
+    },
+    # Survives application crashes; a power cut may lose the last commits.
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # No fsync at all. For tests, benchmarks and throwaway databases.
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -128000,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+
+
+def resolve_pragmas(settings) -> Dict[str, Any]:
+    """The selected profile with any per-PRAGMA overrides from Settings."""
+    if settings.SQLITE_PRAGMA_PROFILE not in PRAGMA_PROFILES:
+        raise ValueError(
+            f"Unknown SQLITE_PRAGMA_PROFILE {settings.SQLITE_PRAGMA_PROFILE!r}, "
+            f"expected one of {', '.join(PRAGMA_PROFILES)}"
+        )
+    pragmas = dict(PRAGMA_PROFILES[settings.SQLITE_PRAGMA_PROFILE])
+    overrides = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+    pragmas.update({name: value for name, value in overrides.items() if value is not None})
+    # Not a tuning knob: the schema relies on ON DELETE rules
+    pragmas["foreign_keys"] = "ON"
+    return pragmas
+
+
+def apply_pragmas(dbapi_connection, connection_record, pragmas: Dict[str, Any]) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
@@ -0,0 +1,114 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Expanded IN lists differ only in the number of placeholders
+_IN_LIST = re.compile(r"\(\?(?:, \?)+\)")
+
+
+def statement_shape(statement: str) -> str:
+    return _IN_LIST.sub("(?)", " ".join(statement.split()))
+
+
+@dataclass
+class QueryStats:
+    """Statements run on behalf of one request (or one tracked block)."""
+
+    count: int = 0
+    total_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """SELECT shapes run at least ``threshold`` times, the usual N+1 sign."""
+        return [
+            (shape, count) for shape, count in self.shapes.most_common()
+            if count >= threshold and shape.startswith("SELECT")
+        ]
+
+
+# Every active tracker sees each statement, so a test's assert_max_queries
+# still counts while the request middleware tracks the same request.
+_current: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+def current_query_stats() -> Tuple[QueryStats, ...]:
+    return _current.get()
+
+
+@contextmanager
+def use_query_stats(trackers: Tuple[QueryStats, ...]) -> Iterator[None]:
+    token = _current.set(trackers)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    with use_query_stats(_current.get() + (stats,)):
+        yield stats
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail if the block runs more than ``limit`` statements.
+
+        with assert_max_queries(3):
+            client.get("/clients/appointments/my", headers=auth)
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        shapes = "\n".join(f"  {count}x {shape}" for shape, count in stats.shapes.most_common())
+        raise AssertionError(f"Expected at most {limit} queries, ran {stats.count}:\n{shapes}")
+
+
+# "SessionRepository.get_by_id" while a repository method runs. Statements
+# execute in SQLAlchemy's greenlet, whose stack does not reach the caller,
+# so the name is carried in the context instead.
+_repository_method: ContextVar[Optional[str]] = ContextVar("repository_method", default=None)
+
+
+def current_repository_method() -> Optional[str]:
+    return _repository_method.get()
+
+
+@contextmanager
+def repository_call(name: str) -> Iterator[None]:
+    token = _repository_method.set(name)
+    try:
+        yield
+    finally:
+        _repository_method.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get():
+        context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "query_started", None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        for stats in _current.get():
+            stats.record(statement, elapsed)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.query_stats import current_repository_method, statement_shape
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Types of the bound values, never the values themselves."""
+    if executemany:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}" if parameters else "[]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{name}: {type(value).__name__}" for name, value in parameters.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in parameters or ()) + ")"
+
+
+def _explain(dbapi_connection, statement: str, parameters: Any) -> List[str]:
+    # A raw cursor keeps the EXPLAIN itself out of the query stats and the
+    # slow log.
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+        return [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    """Statements slower than ``threshold`` seconds, with their query plan.
+
+    Entries go to a rotating JSON-lines file and to an in-memory ring of the
+    most recent ones for /admin/slow-queries.
+    """
+
+    def __init__(self, threshold: float, path: str, max_bytes: int, backups: int, keep: int, explain: bool = True):
+        self.threshold = threshold
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.explain = explain
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=keep)
+        self.logged = 0
+        self._logger: Optional[logging.Logger] = None
+
+    def install(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < self.threshold:
+            return
+
+        plan = None
+        if self.explain and statement.lstrip().upper().startswith(_EXPLAINABLE):
+            try:
+                plan = _explain(
+                    conn.connection.dbapi_connection, statement,
+                    parameters[0] if executemany else parameters,
+                )
+            except Exception as error:
+                plan = [f"EXPLAIN failed: {error}"]
+
+        self.record({
+            "at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "duration_ms": round(elapsed * 1000, 3),
+            "caller": current_repository_method(),
+            "statement": statement_shape(statement),
+            "parameters": parameter_shape(parameters, executemany),
+            "plan": plan,
+        })
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        self.logged += 1
+        self.recent.append(entry)
+        self._get_logger().warning(json.dumps(entry))
+
+    def _get_logger(self) -> logging.Logger:
+        # The file is only opened once something is slow
+        if self._logger is None:
+            logger = logging.getLogger("app.slow_queries")
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(self.path, maxBytes=self.max_bytes, backupCount=self.backups)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.WARNING)
+            self._logger = logger
+        return self._logger
+
+    def entries(self, limit: int) -> List[Dict[str, Any]]:
+        return list(reversed(self.recent))[:limit]
@@ -0,0 +1,206 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.database.query_stats import QueryStats, current_query_stats, use_query_stats
+
+T = TypeVar("T")
+WriteTransaction = Callable[[DBManager], Awaitable[T]]
+Job = Tuple[WriteTransaction, asyncio.Future, float]
+
+
+def _with_query_stats(fn: WriteTransaction, trackers: Tuple[QueryStats, ...]) -> WriteTransaction:
+    # The writer task does not inherit the caller's context; count the
+    # job's statements against the request that submitted it.
+    async def run(db: DBManager):
+        with use_query_stats(trackers):
+            return await fn(db)
+    return run
+
+
+def is_busy_error(error: OperationalError) -> bool:
+    message = str(error.orig).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+class WriteQueue:
+    """Runs write transactions one at a time on the writer connection.
+
+    ``submit(fn)`` queues ``fn(db)``; the writer task runs it inside a fresh
+    DBManager, commits, and hands the result (or exception) back to the
+    caller. Busy errors from other processes are retried with jittered
+    exponential backoff, so ``fn`` must be safe to run again.
+
+    With group commit the writer waits up to ``group_window`` seconds for
+    more jobs (at most ``group_max_ops``) and commits them together. Each
+    job runs in its own savepoint, so a failing job is rolled back alone
+    and only its caller sees the error.
+    """
+
+    def __init__(
+        self,
+        session_factory=async_session_maker,
+        max_retries: int = 5,
+        base_delay: float = 0.02,
+        group_commit: bool = False,
+        group_window: float = 0.002,
+        group_max_ops: int = 50,
+    ):
+        self.session_factory = session_factory
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.group_commit = group_commit
+        self.group_window = group_window
+        self.group_max_ops = group_max_ops
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.processed = 0
+        self.failed = 0
+        self.retries = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.commits = 0
+
+    @property
+    def queue_length(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(), name="db-writer")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, fn: WriteTransaction) -> T:
+        self.start()
+        trackers = current_query_stats()
+        if trackers:
+            fn = _with_query_stats(fn, trackers)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fn, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> List[Job]:
+        batch = [await self._queue.get()]
+        if not self.group_commit:
+            return batch
+        deadline = time.perf_counter() + self.group_window
+        while len(batch) < self.group_max_ops:
+            if self._queue.empty():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            else:
+                batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                jobs = [job for job in batch if not job[1].cancelled()]
+                if not jobs:
+                    continue
+                now = time.perf_counter()
+                for _, _, queued_at in jobs:
+                    self.total_wait += now - queued_at
+                    self.max_wait = max(self.max_wait, now - queued_at)
+                try:
+                    outcomes = await self._execute([fn for fn, _, _ in jobs])
+                except Exception as error:
+                    outcomes = [(error, None)] * len(jobs)
+                for (_, future, _), (error, result) in zip(jobs, outcomes):
+                    if error is None:
+                        self.processed += 1
+                    else:
+                        self.failed += 1
+                    if future.cancelled():
+                        continue
+                    if error is None:
+                        future.set_result(result)
+                    else:
+                        future.set_exception(error)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _execute(self, fns: List[WriteTransaction]) -> List[Tuple[Optional[Exception], Any]]:
+        attempt = 0
+        while True:
+            try:
+                async with DBManager(self.session_factory) as db:
+                    if len(fns) == 1:
+                        outcomes = [(None, await fns[0](db))]
+                    else:
+                        outcomes = [await self._run_in_savepoint(db, fn) for fn in fns]
+                    if any(error is None for error, _ in outcomes):
+                        await db.commit()
+                        self.commits += 1
+                return outcomes
+            except OperationalError as error:
+                if not is_busy_error(error) or attempt >= self.max_retries:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(random.uniform(0, self.base_delay * 2 ** attempt))
+                attempt += 1
+
+    @staticmethod
+    async def _run_in_savepoint(db: DBManager, fn: WriteTransaction) -> Tuple[Optional[Exception], Any]:
+        savepoint = await db.session.begin_nested()
+        try:
+            result = await fn(db)
+        except OperationalError as error:
+            # A busy database fails the whole batch, which is retried.
+            if is_busy_error(error):
+                raise
+            await savepoint.rollback()
+            return error, None
+        except Exception as error:
+            await savepoint.rollback()
+            return error, None
+        await savepoint.commit()
+        return None, result
+
+    def stats(self) -> Dict[str, Any]:
+        done = (self.processed + self.failed) or 1
+        return {
+            "queue_length": self.queue_length,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "avg_wait_ms": round(self.total_wait / done * 1000, 3),
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "group_commit": self.group_commit,
+            "commits": self.commits,
+            "avg_ops_per_commit": round(self.processed / (self.commits or 1), 2),
+        }
+
+
+write_queue = WriteQueue(
+    max_retries=settings.DB_WRITE_MAX_RETRIES,
+    base_delay=settings.DB_WRITE_RETRY_BASE_DELAY_MS / 1000,
+    group_commit=settings.DB_GROUP_COMMIT_ENABLED,
+    group_window=settings.DB_GROUP_COMMIT_WINDOW_MS / 1000,
+    group_max_ops=settings.DB_GROUP_COMMIT_MAX_OPS,
+)
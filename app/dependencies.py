@@ -1,40 +1,149 @@
-from fastapi import Depends, HTTPException, status
+from typing import Hashable, Optional, Tuple, Type
+from fastapi import Depends, Form, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.database.database import async_session_maker
-from app.repositories.user import UserRepository
+from pydantic import BaseModel
+from app.database.database import read_session_maker
+from app.database.db_manager import DBManager
+from app.database.writer import WriteQueue, write_queue
 from app.services.auth import AuthService
-from app.schemes.user import TokenData, UserInDB
+from app.config import settings
+from app.schemes.user import TokenData, UserInDB, UserClaims
+from app.utils.principal_cache import Principal, principal_cache
+from app.utils.revocation import revoked_claims
+from app.utils.rate_limit import RateLimiter, RouteRateLimit, retry_after_header
+from app.utils.metrics import rate_limited
+from app.utils.serialization import parse_fields
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
+rate_limiter = RateLimiter(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+login_rate_limit = RouteRateLimit(
+    "auth.login",
+    per_ip=settings.RATE_LIMIT_LOGIN_PER_IP,
+    per_user=settings.RATE_LIMIT_LOGIN_PER_USER,
+    per_route=settings.RATE_LIMIT_LOGIN_PER_ROUTE,
+)
+booking_rate_limit = RouteRateLimit(
+    "clients.book",
+    per_ip=settings.RATE_LIMIT_BOOKING_PER_IP,
+    per_user=settings.RATE_LIMIT_BOOKING_PER_USER,
+    per_route=settings.RATE_LIMIT_BOOKING_PER_ROUTE,
+)
 
-async def get_db():
-    async with async_session_maker() as session:
-        yield session
 
+async def get_db_manager():
+    # One read-only session per request, shared by every dependency that
+    # asks for it. Writes go through get_write_queue.
+    async with DBManager(read_session_maker) as db:
+        yield db
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-):
-    auth_service = AuthService(UserRepository(db))
-    token_data = auth_service.decode_token(token)
+
+def get_write_queue() -> WriteQueue:
+    return write_queue
+
+
+def sparse_fields(schema: Type[BaseModel]):
+    """Dependency for ``?fields=id,name`` on endpoints that return ``schema``.
+
+    Yields None when every field is wanted; routes pass the tuple on to the
+    repository (columns to load) and to json_list/json_object.
+    """
+    description = f"Comma-separated subset of: {', '.join(schema.model_fields)}"
+
+    def dependency(fields: Optional[str] = Query(None, description=description)) -> Optional[Tuple[str, ...]]:
+        try:
+            return parse_fields(schema, fields)
+        except ValueError as error:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+
+    return dependency
+
+
+def _decode_token(token: str) -> TokenData:
+    token_data = AuthService(None).decode_token(token)
     if token_data is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user_repository = UserRepository(db)
-    user = await user_repository.get_by_username(token_data.username)
+    return token_data
+
+
+async def _resolve_principal(token_data: TokenData, db: DBManager) -> Principal:
+    principal = principal_cache.get(token_data.user_id)
+    if principal is not None and principal.user.username == token_data.username:
+        return principal
+
+    user = await db.users.get_by_username(token_data.username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    return user
\ No newline at end of file
+
+    master_id = None
+    if user.role == "master":
+        master = await db.masters.get_by_user_id(user.id)
+        if master:
+            master_id = master.id
+
+    principal = Principal(user=UserInDB.model_validate(user), master_id=master_id)
+    principal_cache.set(user.id, principal)
+    return principal
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: DBManager = Depends(get_db_manager)
+) -> Principal:
+    return await _resolve_principal(_decode_token(token), db)
+
+
+async def get_current_user(principal: Principal = Depends(get_current_principal)) -> UserInDB:
+    return principal.user
+
+
+async def get_current_claims(
+    token: str = Depends(oauth2_scheme),
+    db: DBManager = Depends(get_db_manager)
+) -> UserClaims:
+    """Identity for read-only endpoints that only need id and role.
+
+    With AUTH_TRUST_TOKEN_CLAIMS the verified token is enough and the
+    database is not touched; tokens of revoked users take the full path.
+    """
+    token_data = _decode_token(token)
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and not revoked_claims.is_revoked(token_data.user_id, token_data.issued_at):
+        return UserClaims(id=token_data.user_id, username=token_data.username, role=token_data.role)
+
+    user = (await _resolve_principal(token_data, db)).user
+    return UserClaims(id=user.id, username=user.username, role=user.role)
+
+
+def _enforce_rate_limit(limit: RouteRateLimit, request: Request, user: Optional[Hashable]):
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    ip = request.client.host if request.client else None
+    wait = rate_limiter.acquire(limit.limits(ip, user))
+    if wait:
+        rate_limited.inc(limit.route)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, try again later",
+            headers={"Retry-After": retry_after_header(wait)},
+        )
+
+
+# The rate limit dependencies run before anything that touches bcrypt or the
+# database, so they only look at the request itself.
+async def limit_login(request: Request, username: str = Form("")):
+    _enforce_rate_limit(login_rate_limit, request, username.lower() or None)
+
+
+async def limit_booking(request: Request, token: Optional[str] = Depends(optional_oauth2_scheme)):
+    token_data = AuthService(None).decode_token(token) if token else None
+    _enforce_rate_limit(booking_rate_limit, request, token_data.user_id if token_data else None)
@@ -0,0 +1,140 @@
+import logging
+import time
+from typing import Dict, Tuple
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from app.config import settings
+from app.database.query_stats import track_queries
+from app.utils.compression import BrotliResponder, preferred_encoding
+from app.utils.metrics import http_request_duration
+
+
+query_logger = logging.getLogger("app.queries")
+
+
+def _route_name(request: Request) -> str:
+    route = request.scope.get("route")
+    return f"{request.method} {route.path if route else request.url.path}"
+
+
+async def query_stats_middleware(request: Request, call_next):
+    with track_queries() as stats:
+        response = await call_next(request)
+
+    db_time_ms = stats.total_time * 1000
+    if settings.QUERY_STATS_HEADERS:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Query-Time-Ms"] = f"{db_time_ms:.2f}"
+        response.headers.append("Server-Timing", f"db;dur={db_time_ms:.2f}")
+
+    repeated = stats.repeated(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        shape, count = repeated[0]
+        query_logger.warning(
+            "%s: %d queries in %.2f ms, possible N+1: %dx %s",
+            _route_name(request), stats.count, db_time_ms, count, shape,
+        )
+    elif stats.count > settings.QUERY_BUDGET:
+        query_logger.warning(
+            "%s: %d queries in %.2f ms, over the budget of %d",
+            _route_name(request), stats.count, db_time_ms, settings.QUERY_BUDGET,
+        )
+    else:
+        query_logger.debug("%s: %d queries in %.2f ms", _route_name(request), stats.count, db_time_ms)
+    return response
+
+
+# id(route) -> (router, path template). Routes are not hashable and live as
+# long as the app. Unmatched paths share one series so scanners cannot blow
+# up the label set.
+_route_labels: Dict[int, Tuple[str, str]] = {}
+
+
+def _labels_for(route) -> Tuple[str, str]:
+    if route is None:
+        return ("", "unmatched")
+    labels = _route_labels.get(id(route))
+    if labels is None:
+        router = route.endpoint.__module__.rsplit(".", 1)[-1] if hasattr(route, "endpoint") else ""
+        labels = _route_labels[id(route)] = (router, route.path)
+    return labels
+
+
+class MetricsMiddleware:
+    """Records request latency per route.
+
+    Plain ASGI instead of app.middleware("http"), which would add a task and
+    a response stream wrapper to every request just to read the status code.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            router, path = _labels_for(scope.get("route"))
+            http_request_duration.observe(
+                time.perf_counter() - started, router, scope["method"], path, str(status_code)
+            )
+
+
+class CompressionMiddleware:
+    """gzip or brotli for responses of at least ``minimum_size`` bytes.
+
+    The encoding is negotiated from Accept-Encoding (br when the optional
+    brotli package is installed). Responses that already carry a
+    Content-Encoding, such as precompressed static files, pass through.
+    A compressed body is a different representation, so a strong ETag on
+    it is weakened; If-None-Match uses the weak comparison anyway.
+    """
+
+    def __init__(self, app, minimum_size: int, gzip_level: int, brotli_quality: int):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = preferred_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding == "br":
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif encoding == "gzip":
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            # Still adds Vary: Accept-Encoding for shared caches
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        async def send_with_fixed_headers(message):
+            if message["type"] == "http.response.start" and not responder.content_encoding_set:
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if etag and "content-encoding" in headers and not etag.startswith("W/"):
+                    headers["etag"] = f"W/{etag}"
+                # The responder appends Accept-Encoding even when the app
+                # (static files) already named it
+                vary = headers.get("vary")
+                if vary:
+                    headers["vary"] = ", ".join(dict.fromkeys(token.strip() for token in vary.split(",")))
+            await send(message)
+
+        await responder(scope, receive, send_with_fixed_headers)
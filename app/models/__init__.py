@@ -5,6 +5,7 @@ from .session import Session
 from .appointment import Appointment
 from .review import Review
 from .shift import Shift
+from .archive import AppointmentArchive, SessionArchive
 
 __all__ = [
     "User",
@@ -13,5 +14,7 @@ __all__ = [
     "Session",
     "Appointment",
     "Review",
-    "Shift"
+    "Shift",
+    "AppointmentArchive",
+    "SessionArchive"
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, DateTime, ForeignKey
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 from typing import TYPE_CHECKING
@@ -9,20 +9,25 @@ if TYPE_CHECKING:
     from app.models.master import Master
     from app.models.service import Service
     from app.models.session import Session
+    from app.models.review import Review
 
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index("ix_appointments_status_created_at", "status", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    client_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    session_id: Mapped[int] = mapped_column(ForeignKey("sessions.id"))
-    service_id: Mapped[int] = mapped_column(ForeignKey("services.id"))
-    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id"))
+    client_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    session_id: Mapped[int] = mapped_column(ForeignKey("sessions.id", ondelete="CASCADE"), index=True)
+    service_id: Mapped[int] = mapped_column(ForeignKey("services.id", ondelete="RESTRICT"))
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id", ondelete="CASCADE"), index=True)
     status: Mapped[str] = mapped_column(String(20), default="booked")  # 'booked', 'completed', 'cancelled'
 
     # Relationships
     client: Mapped["User"] = relationship("User", back_populates="appointments")
     master: Mapped["Master"] = relationship("Master", back_populates="appointments")
     service: Mapped["Service"] = relationship("Service", back_populates="appointments")
-    session: Mapped["Session"] = relationship("Session", back_populates="appointment")
\ No newline at end of file
+    session: Mapped["Session"] = relationship("Session", back_populates="appointment")
+    review: Mapped["Review"] = relationship("Review", back_populates="appointment", uselist=False, passive_deletes="all")
\ No newline at end of file
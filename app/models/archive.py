@@ -0,0 +1,35 @@
+from sqlalchemy import String, DateTime, Boolean, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+from datetime import datetime
+
+
+# Cold copies of finished rows, moved here by ArchiveService. Rows keep their
+# original ids and timestamps. session_id is a plain column because the
+# session may itself be archived.
+class AppointmentArchive(Base):
+    __tablename__ = "appointments_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    client_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    session_id: Mapped[int] = mapped_column(index=True)
+    service_id: Mapped[int] = mapped_column(ForeignKey("services.id", ondelete="RESTRICT"))
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id", ondelete="CASCADE"), index=True)
+    status: Mapped[str] = mapped_column(String(20))
+    archived_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+
+class SessionArchive(Base):
+    __tablename__ = "sessions_archive"
+    __table_args__ = (
+        Index("ix_sessions_archive_master_id_date", "master_id", "date"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id", ondelete="CASCADE"))
+    service_id: Mapped[int] = mapped_column(ForeignKey("services.id", ondelete="RESTRICT"))
+    date: Mapped[datetime] = mapped_column(DateTime)
+    start_time: Mapped[datetime] = mapped_column(DateTime)
+    end_time: Mapped[datetime] = mapped_column(DateTime)
+    is_available: Mapped[bool] = mapped_column(Boolean)
+    archived_at: Mapped[datetime] = mapped_column(server_default=func.now())
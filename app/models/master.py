@@ -15,14 +15,14 @@ class Master(Base):
     __tablename__ = "masters"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
     name: Mapped[str] = mapped_column(String(100))
     specialization: Mapped[str] = mapped_column(String(100))
     bio: Mapped[str] = mapped_column(String(500), nullable=True)
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="master_profile")
-    appointments: Mapped[list["Appointment"]] = relationship("Appointment", back_populates="master")
-    reviews: Mapped[list["Review"]] = relationship("Review", back_populates="master")
-    shifts: Mapped[list["Shift"]] = relationship("Shift", back_populates="master")
-    sessions: Mapped[list["Session"]] = relationship("Session", back_populates="master")
\ No newline at end of file
+    appointments: Mapped[list["Appointment"]] = relationship("Appointment", back_populates="master", passive_deletes="all")
+    reviews: Mapped[list["Review"]] = relationship("Review", back_populates="master", passive_deletes="all")
+    shifts: Mapped[list["Shift"]] = relationship("Shift", back_populates="master", passive_deletes="all")
+    sessions: Mapped[list["Session"]] = relationship("Session", back_populates="master", passive_deletes="all")
\ No newline at end of file
@@ -14,9 +14,9 @@ class Review(Base):
     __tablename__ = "reviews"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    client_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id"))
-    appointment_id: Mapped[int] = mapped_column(ForeignKey("appointments.id"))
+    client_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id", ondelete="CASCADE"), index=True)
+    appointment_id: Mapped[int] = mapped_column(ForeignKey("appointments.id", ondelete="CASCADE"), index=True)
     rating: Mapped[int] = mapped_column(Integer)  # 1-5
     comment: Mapped[str] = mapped_column(String(500), nullable=True)
 
@@ -18,5 +18,5 @@ class Service(Base):
     price: Mapped[float] = mapped_column(Float)
 
     # Relationships
-    sessions: Mapped[list["Session"]] = relationship("Session", back_populates="service")
-    appointments: Mapped[list["Appointment"]] = relationship("Appointment", back_populates="service")
\ No newline at end of file
+    sessions: Mapped[list["Session"]] = relationship("Session", back_populates="service", passive_deletes="all")
+    appointments: Mapped[list["Appointment"]] = relationship("Appointment", back_populates="service", passive_deletes="all")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey
+from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 from typing import TYPE_CHECKING
@@ -12,10 +12,20 @@ if TYPE_CHECKING:
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_master_id_date", "master_id", "date"),
+        # Free slots are looked up far more often than the whole schedule
+        Index(
+            "ix_sessions_available_master_id_date",
+            "master_id",
+            "date",
+            sqlite_where=text("is_available = 1"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id"))
-    service_id: Mapped[int] = mapped_column(ForeignKey("services.id"))
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id", ondelete="CASCADE"))
+    service_id: Mapped[int] = mapped_column(ForeignKey("services.id", ondelete="RESTRICT"))
     date: Mapped[datetime] = mapped_column(DateTime)
     start_time: Mapped[datetime] = mapped_column(DateTime)
     end_time: Mapped[datetime] = mapped_column(DateTime)
@@ -24,4 +34,4 @@ class Session(Base):
     # Relationships
     master: Mapped["Master"] = relationship("Master", back_populates="sessions")
     service: Mapped["Service"] = relationship("Service", back_populates="sessions")
-    appointment: Mapped["Appointment"] = relationship("Appointment", back_populates="session", uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
+    appointment: Mapped["Appointment"] = relationship("Appointment", back_populates="session", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, DateTime, ForeignKey
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 from typing import TYPE_CHECKING
@@ -10,9 +10,12 @@ if TYPE_CHECKING:
 
 class Shift(Base):
     __tablename__ = "shifts"
+    __table_args__ = (
+        Index("ix_shifts_master_id_date", "master_id", "date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id"))
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id", ondelete="CASCADE"))
     date: Mapped[datetime] = mapped_column(DateTime)
     start_time: Mapped[datetime] = mapped_column(DateTime)
     end_time: Mapped[datetime] = mapped_column(DateTime)
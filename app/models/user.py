@@ -20,6 +20,6 @@ class User(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
     # Relationships
-    appointments: Mapped[list["Appointment"]] = relationship("Appointment", back_populates="client")
-    reviews: Mapped[list["Review"]] = relationship("Review", back_populates="client")
-    master_profile: Mapped["Master"] = relationship("Master", back_populates="user", uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
+    appointments: Mapped[list["Appointment"]] = relationship("Appointment", back_populates="client", passive_deletes="all")
+    reviews: Mapped[list["Review"]] = relationship("Review", back_populates="client", passive_deletes="all")
+    master_profile: Mapped["Master"] = relationship("Master", back_populates="user", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
\ No newline at end of file
@@ -1,85 +1,128 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, delete, exists, insert, update
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from app.models.appointment import Appointment
+from app.models.archive import AppointmentArchive
+from app.models.review import Review
+from app.models.session import Session
+from app.repositories.base import BaseRepository
 from app.schemes.appointment import AppointmentCreate, AppointmentUpdate
 
 
-class AppointmentRepository:
+# Sparse fieldsets (fields=...) start from the bare statements, since
+# load_only cannot be combined with the relationship loaders.
+_by_client_id = select(Appointment).where(Appointment.client_id == bindparam("client_id"))
+_select_by_client_id = (
+    _by_client_id
+    .options(selectinload(Appointment.master))
+    .options(selectinload(Appointment.service))
+    .options(selectinload(Appointment.session))
+)
+_by_master_id = select(Appointment).where(Appointment.master_id == bindparam("master_id"))
+_select_by_master_id = (
+    _by_master_id
+    .options(selectinload(Appointment.client))
+    .options(selectinload(Appointment.service))
+    .options(selectinload(Appointment.session))
+)
+
+# Appointments in these states never change again and can be archived
+FINISHED_STATUSES = ("completed", "cancelled")
+
+
+class AppointmentRepository(BaseRepository):
+    model = Appointment
+    archive_model = AppointmentArchive
+
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
     async def create(self, appointment_data: AppointmentCreate) -> Appointment:
-        appointment = Appointment(
-            client_id=appointment_data.client_id,
-            session_id=appointment_data.session_id,
-            service_id=appointment_data.service_id,
-            master_id=appointment_data.master_id,
-            status=appointment_data.status
+        result = await self.db_session.execute(
+            insert(Appointment)
+            .values(
+                client_id=appointment_data.client_id,
+                session_id=appointment_data.session_id,
+                service_id=appointment_data.service_id,
+                master_id=appointment_data.master_id,
+                status=appointment_data.status
+            )
+            .returning(Appointment)
         )
-        self.db_session.add(appointment)
-        await self.db_session.commit()
-        await self.db_session.refresh(appointment)
+        appointment = result.scalar_one()
         return appointment
 
-    async def get_by_id(self, appointment_id: int) -> Optional[Appointment]:
-        result = await self.db_session.execute(
-            select(Appointment)
-            .options(selectinload(Appointment.client))
+    def _with_relations(self, stmt):
+        return (
+            stmt.options(selectinload(Appointment.client))
             .options(selectinload(Appointment.master))
             .options(selectinload(Appointment.service))
             .options(selectinload(Appointment.session))
-            .where(Appointment.id == appointment_id)
         )
-        return result.scalar_one_or_none()
 
-    async def get_by_client_id(self, client_id: int) -> List[Appointment]:
+    async def get_by_id(self, appointment_id: int) -> Optional[Appointment]:
         result = await self.db_session.execute(
-            select(Appointment)
-            .options(selectinload(Appointment.master))
-            .options(selectinload(Appointment.service))
-            .options(selectinload(Appointment.session))
-            .where(Appointment.client_id == client_id)
+            self._with_relations(select(Appointment).where(Appointment.id == appointment_id))
         )
+        return result.scalar_one_or_none()
+
+    async def get_by_client_id(
+        self, client_id: int, include_history: bool = False, fields: Optional[Sequence[str]] = None
+    ) -> List[Appointment]:
+        stmt = self._load_only(_by_client_id, fields) if fields else _select_by_client_id
+        result = await self.db_session.execute(stmt, {"client_id": client_id})
+        appointments = list(result.scalars().all())
+        if include_history:
+            appointments += await self._history(AppointmentArchive.client_id == client_id, fields=fields)
+        return appointments
+
+    async def get_by_master_id(
+        self, master_id: int, include_history: bool = False, fields: Optional[Sequence[str]] = None
+    ) -> List[Appointment]:
+        stmt = self._load_only(_by_master_id, fields) if fields else _select_by_master_id
+        result = await self.db_session.execute(stmt, {"master_id": master_id})
+        appointments = list(result.scalars().all())
+        if include_history:
+            appointments += await self._history(AppointmentArchive.master_id == master_id, fields=fields)
+        return appointments
+
+    async def get_all(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Appointment]:
+        stmt = select(Appointment).offset(skip).limit(limit).order_by(Appointment.id)
+        stmt = self._load_only(stmt, fields) if fields else self._with_relations(stmt)
+        result = await self.db_session.execute(stmt)
         return result.scalars().all()
 
-    async def get_by_master_id(self, master_id: int) -> List[Appointment]:
+    async def update(self, appointment_id: int, appointment_data: AppointmentUpdate) -> Optional[Appointment]:
         result = await self.db_session.execute(
-            select(Appointment)
-            .options(selectinload(Appointment.client))
-            .options(selectinload(Appointment.service))
-            .options(selectinload(Appointment.session))
-            .where(Appointment.master_id == master_id)
+            update(Appointment)
+            .where(Appointment.id == appointment_id)
+            .values(**appointment_data.dict(exclude_unset=True))
+            .returning(Appointment)
+            .execution_options(populate_existing=True)
         )
-        return result.scalars().all()
+        appointment = result.scalar_one_or_none()
+        return appointment
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Appointment]:
+    async def delete(self, appointment_id: int) -> int:
         result = await self.db_session.execute(
-            select(Appointment)
-            .options(selectinload(Appointment.client))
-            .options(selectinload(Appointment.master))
-            .options(selectinload(Appointment.service))
-            .options(selectinload(Appointment.session))
-            .offset(skip)
-            .limit(limit)
-            .order_by(Appointment.id)
+            delete(Appointment).where(Appointment.id == appointment_id)
         )
-        return result.scalars().all()
-
-    async def update(self, appointment_id: int, appointment_data: AppointmentUpdate) -> Optional[Appointment]:
-        appointment = await self.get_by_id(appointment_id)
-        if appointment:
-            for field, value in appointment_data.dict(exclude_unset=True).items():
-                setattr(appointment, field, value)
-            await self.db_session.commit()
-            await self.db_session.refresh(appointment)
-        return appointment
+        return result.rowcount
 
-    async def delete(self, appointment_id: int) -> bool:
-        appointment = await self.get_by_id(appointment_id)
-        if appointment:
-            await self.db_session.delete(appointment)
-            await self.db_session.commit()
-            return True
-        return False
\ No newline at end of file
+    async def archive_batch(self, cutoff: datetime, batch_size: int) -> int:
+        # Reviewed appointments stay hot: reviews reference them and are
+        # read online for master ratings.
+        result = await self.db_session.execute(
+            self._archivable_ids(
+                select(Appointment.id)
+                .join(Session, Session.id == Appointment.session_id)
+                .where(Appointment.status.in_(FINISHED_STATUSES))
+                .where(Session.end_time < cutoff)
+                .where(~exists().where(Review.appointment_id == Appointment.id))
+            )
+            .limit(batch_size)
+        )
+        return await self._move_to_archive(result.scalars().all())
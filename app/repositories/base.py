@@ -1,5 +1,103 @@
+import functools
+import inspect
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import load_only
+from app.database.query_stats import repository_call
+from app.utils.table_versions import mark_changed
+
+
+def _named(method):
+    # Lets the slow query log name the repository method behind a statement
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        with repository_call(f"{type(self).__name__}.{method.__name__}"):
+            return await method(self, *args, **kwargs)
+    return wrapper
+
+
+def _name_methods(cls) -> None:
+    for name, value in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.iscoroutinefunction(value):
+            setattr(cls, name, _named(value))
+
+
 class BaseRepository:
     model = None
     schema = None
+    # Column that identifies a row in bulk upserts; needs a unique index
+    upsert_key = "id"
+    # Cold table with the same columns, see ArchiveService
+    archive_model = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _name_methods(cls)
+
+    async def get_ids_by_key(self, keys: Iterable[Any]) -> Dict[Any, int]:
+        keys = set(keys)
+        if not keys:
+            # Rows that only create, e.g. imports without ids
+            return {}
+        key_column = getattr(self.model, self.upsert_key)
+        result = await self.db_session.execute(
+            select(key_column, self.model.id).where(key_column.in_(keys))
+        )
+        return dict(result.all())
+
+    async def next_id(self) -> int:
+        # Only meaningful on the writer, which holds the write lock
+        result = await self.db_session.execute(select(func.max(self.model.id)))
+        return (result.scalar() or 0) + 1
+
+    def _upsert_set(self, excluded, columns: List[str]) -> Dict[str, Any]:
+        values = {name: excluded[name] for name in columns if name not in ("id", self.upsert_key)}
+        values["updated_at"] = func.now()
+        return values
+
+    async def upsert_many(self, rows: List[Dict[str, Any]]) -> None:
+        # One executemany of INSERT ... ON CONFLICT DO UPDATE. All rows must
+        # have the same keys; no RETURNING, which would force a statement
+        # per row.
+        table = self.model.__table__
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[self.upsert_key]],
+            set_=self._upsert_set(stmt.excluded, list(rows[0])),
+        )
+        await self.db_session.execute(stmt, rows)
+        mark_changed(self.db_session, table.name)
+
+    def _load_only(self, stmt, fields: Sequence[str], model=None):
+        # Sparse fieldsets: only these columns are selected (the primary key
+        # always comes along). The statement must not load relationships.
+        model = model or self.model
+        return stmt.options(load_only(*(getattr(model, name) for name in fields)))
+
+    async def _history(self, *criteria, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        stmt = select(self.archive_model).where(*criteria).order_by(self.archive_model.id)
+        if fields:
+            stmt = self._load_only(stmt, fields, self.archive_model)
+        result = await self.db_session.execute(stmt)
+        return list(result.scalars().all())
+
+    def _archivable_ids(self, query):
+        # The newest row always stays hot: SQLite hands out max(id) + 1 as the
+        # next id, so archiving it would let a new row reuse an archived id.
+        newest = select(func.max(self.model.id)).scalar_subquery()
+        return query.where(self.model.id < newest).order_by(self.model.id)
+
+    async def _move_to_archive(self, ids: Sequence[int]) -> int:
+        if not ids:
+            return 0
+        table = self.model.__table__
+        columns = [column.name for column in table.columns]
+        await self.db_session.execute(
+            insert(self.archive_model).from_select(columns, select(*table.columns).where(table.c.id.in_(ids)))
+        )
+        await self.db_session.execute(delete(table).where(table.c.id.in_(ids)))
+        return len(ids)
+
 
-    # TODO реализовать все необходимые методы репозитория
+_name_methods(BaseRepository)
@@ -1,25 +1,47 @@
-from typing import List, Optional
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, delete, insert, update
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from app.database.after_commit import after_commit
 from app.models.master import Master
+from app.repositories.base import BaseRepository
 from app.schemes.master import MasterCreate, MasterUpdate
+from app.utils.principal_cache import invalidate_principal
+from app.utils.table_versions import mark_changed
 
 
-class MasterRepository:
+_select_by_user_id = select(Master).where(Master.user_id == bindparam("user_id"))
+_page = (
+    select(Master)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+    .order_by(Master.id)
+)
+_select_page = _page.options(selectinload(Master.user))
+
+
+class MasterRepository(BaseRepository):
+    model = Master
+
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
     async def create(self, master_data: MasterCreate) -> Master:
-        master = Master(
-            user_id=master_data.user_id,
-            name=master_data.name,
-            specialization=master_data.specialization,
-            bio=master_data.bio
+        result = await self.db_session.execute(
+            insert(Master)
+            .values(
+                user_id=master_data.user_id,
+                name=master_data.name,
+                specialization=master_data.specialization,
+                bio=master_data.bio
+            )
+            .returning(Master)
         )
-        self.db_session.add(master)
-        await self.db_session.commit()
-        await self.db_session.refresh(master)
+        master = result.scalar_one()
+        after_commit(self.db_session, partial(invalidate_principal, master.user_id))
+        mark_changed(self.db_session, "masters")
         return master
 
     async def get_by_id(self, master_id: int) -> Optional[Master]:
@@ -34,35 +56,47 @@ class MasterRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_by_user_id(self, user_id: int) -> Optional[Master]:
-        result = await self.db_session.execute(
-            select(Master).where(Master.user_id == user_id)
-        )
+    async def get_by_user_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Optional[Master]:
+        stmt = self._load_only(_select_by_user_id, fields) if fields else _select_by_user_id
+        result = await self.db_session.execute(stmt, {"user_id": user_id})
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Master]:
+    async def get_user_ids(self, master_ids: Iterable[int]) -> Dict[int, int]:
+        master_ids = set(master_ids)
+        if not master_ids:
+            return {}
         result = await self.db_session.execute(
-            select(Master)
-            .options(selectinload(Master.user))
-            .offset(skip)
-            .limit(limit)
-            .order_by(Master.id)
+            select(Master.id, Master.user_id).where(Master.id.in_(master_ids))
         )
+        return dict(result.all())
+
+    async def get_all(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Master]:
+        stmt = self._load_only(_page, fields) if fields else _select_page
+        result = await self.db_session.execute(stmt, {"skip": skip, "limit": limit})
         return result.scalars().all()
 
     async def update(self, master_id: int, master_data: MasterUpdate) -> Optional[Master]:
-        master = await self.get_by_id(master_id)
+        result = await self.db_session.execute(
+            update(Master)
+            .where(Master.id == master_id)
+            .values(**master_data.dict(exclude_unset=True))
+            .returning(Master)
+            .execution_options(populate_existing=True)
+        )
+        master = result.scalar_one_or_none()
         if master:
-            for field, value in master_data.dict(exclude_unset=True).items():
-                setattr(master, field, value)
-            await self.db_session.commit()
-            await self.db_session.refresh(master)
+            after_commit(self.db_session, partial(invalidate_principal, master.user_id))
+            mark_changed(self.db_session, "masters")
         return master
 
-    async def delete(self, master_id: int) -> bool:
-        master = await self.get_by_id(master_id)
-        if master:
-            await self.db_session.delete(master)
-            await self.db_session.commit()
-            return True
-        return False
\ No newline at end of file
+    async def delete(self, master_id: int) -> int:
+        # Sessions, shifts, appointments and reviews go with it (ON DELETE CASCADE)
+        result = await self.db_session.execute(
+            delete(Master).where(Master.id == master_id).returning(Master.user_id)
+        )
+        user_ids = result.scalars().all()
+        for user_id in user_ids:
+            after_commit(self.db_session, partial(invalidate_principal, user_id))
+        if user_ids:
+            mark_changed(self.db_session, "masters")
+        return len(user_ids)
\ No newline at end of file
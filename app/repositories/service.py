@@ -1,24 +1,40 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, delete, insert, update
 from sqlalchemy.future import select
 from app.models.service import Service
+from app.repositories.base import BaseRepository
 from app.schemes.service import ServiceCreate, ServiceUpdate
+from app.utils.table_versions import mark_changed
 
 
-class ServiceRepository:
+_select_page = (
+    select(Service)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+    .order_by(Service.id)
+)
+
+
+class ServiceRepository(BaseRepository):
+    model = Service
+
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
     async def create(self, service_data: ServiceCreate) -> Service:
-        service = Service(
-            name=service_data.name,
-            description=service_data.description,
-            duration=service_data.duration,
-            price=service_data.price
+        result = await self.db_session.execute(
+            insert(Service)
+            .values(
+                name=service_data.name,
+                description=service_data.description,
+                duration=service_data.duration,
+                price=service_data.price
+            )
+            .returning(Service)
         )
-        self.db_session.add(service)
-        await self.db_session.commit()
-        await self.db_session.refresh(service)
+        service = result.scalar_one()
+        mark_changed(self.db_session, "services")
         return service
 
     async def get_by_id(self, service_id: int) -> Optional[Service]:
@@ -27,28 +43,28 @@ class ServiceRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Service]:
-        result = await self.db_session.execute(
-            select(Service)
-            .offset(skip)
-            .limit(limit)
-            .order_by(Service.id)
-        )
+    async def get_all(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Service]:
+        stmt = self._load_only(_select_page, fields) if fields else _select_page
+        result = await self.db_session.execute(stmt, {"skip": skip, "limit": limit})
         return result.scalars().all()
 
     async def update(self, service_id: int, service_data: ServiceUpdate) -> Optional[Service]:
-        service = await self.get_by_id(service_id)
+        result = await self.db_session.execute(
+            update(Service)
+            .where(Service.id == service_id)
+            .values(**service_data.dict(exclude_unset=True))
+            .returning(Service)
+            .execution_options(populate_existing=True)
+        )
+        service = result.scalar_one_or_none()
         if service:
-            for field, value in service_data.dict(exclude_unset=True).items():
-                setattr(service, field, value)
-            await self.db_session.commit()
-            await self.db_session.refresh(service)
+            mark_changed(self.db_session, "services")
         return service
 
-    async def delete(self, service_id: int) -> bool:
-        service = await self.get_by_id(service_id)
-        if service:
-            await self.db_session.delete(service)
-            await self.db_session.commit()
-            return True
-        return False
\ No newline at end of file
+    async def delete(self, service_id: int) -> int:
+        result = await self.db_session.execute(
+            delete(Service).where(Service.id == service_id)
+        )
+        if result.rowcount:
+            mark_changed(self.db_session, "services")
+        return result.rowcount
\ No newline at end of file
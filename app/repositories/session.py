@@ -1,28 +1,61 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, delete, exists, insert, update
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from app.models.appointment import Appointment
+from app.models.archive import SessionArchive
 from app.models.session import Session
+from app.repositories.base import BaseRepository
 from app.schemes.session import SessionCreate, SessionUpdate
 from datetime import datetime
 
 
-class SessionRepository:
+# Hot read paths are built once. A prebuilt statement memoizes its cache key,
+# so executing it only binds new values instead of rebuilding the select and
+# its loader options and looking them up in the compiled cache.
+# Sparse fieldsets (fields=...) start from the bare statements, since
+# load_only cannot be combined with the relationship loaders.
+_by_master_and_date = (
+    select(Session)
+    .where(Session.master_id == bindparam("master_id"))
+    .where(Session.date == bindparam("date"))
+)
+_available_by_master_and_date = _by_master_and_date.where(Session.is_available == True)
+_select_available_by_master_and_date = (
+    _available_by_master_and_date
+    .options(selectinload(Session.master))
+    .options(selectinload(Session.service))
+)
+_select_by_master_and_date = (
+    _by_master_and_date
+    .options(selectinload(Session.master))
+    .options(selectinload(Session.service))
+    .options(selectinload(Session.appointment))
+)
+
+
+class SessionRepository(BaseRepository):
+    model = Session
+    archive_model = SessionArchive
+
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
     async def create(self, session_data: SessionCreate) -> Session:
-        session = Session(
-            master_id=session_data.master_id,
-            service_id=session_data.service_id,
-            date=session_data.date,
-            start_time=session_data.start_time,
-            end_time=session_data.end_time,
-            is_available=session_data.is_available
+        result = await self.db_session.execute(
+            insert(Session)
+            .values(
+                master_id=session_data.master_id,
+                service_id=session_data.service_id,
+                date=session_data.date,
+                start_time=session_data.start_time,
+                end_time=session_data.end_time,
+                is_available=session_data.is_available
+            )
+            .returning(Session)
         )
-        self.db_session.add(session)
-        await self.db_session.commit()
-        await self.db_session.refresh(session)
+        session = result.scalar_one()
         return session
 
     async def get_by_id(self, session_id: int) -> Optional[Session]:
@@ -35,27 +68,27 @@ class SessionRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_available_by_master_and_date(self, master_id: int, date: datetime) -> List[Session]:
-        result = await self.db_session.execute(
-            select(Session)
-            .options(selectinload(Session.master))
-            .options(selectinload(Session.service))
-            .where(Session.master_id == master_id)
-            .where(Session.date == date)
-            .where(Session.is_available == True)
-        )
+    async def get_available_by_master_and_date(
+        self, master_id: int, date: datetime, fields: Optional[Sequence[str]] = None
+    ) -> List[Session]:
+        if fields:
+            stmt = self._load_only(_available_by_master_and_date, fields)
+        else:
+            stmt = _select_available_by_master_and_date
+        result = await self.db_session.execute(stmt, {"master_id": master_id, "date": date})
         return result.scalars().all()
 
-    async def get_by_master_and_date(self, master_id: int, date: datetime) -> List[Session]:
-        result = await self.db_session.execute(
-            select(Session)
-            .options(selectinload(Session.master))
-            .options(selectinload(Session.service))
-            .options(selectinload(Session.appointment))
-            .where(Session.master_id == master_id)
-            .where(Session.date == date)
-        )
-        return result.scalars().all()
+    async def get_by_master_and_date(
+        self, master_id: int, date: datetime, include_history: bool = False, fields: Optional[Sequence[str]] = None
+    ) -> List[Session]:
+        stmt = self._load_only(_by_master_and_date, fields) if fields else _select_by_master_and_date
+        result = await self.db_session.execute(stmt, {"master_id": master_id, "date": date})
+        sessions = list(result.scalars().all())
+        if include_history:
+            sessions += await self._history(
+                SessionArchive.master_id == master_id, SessionArchive.date == date, fields=fields
+            )
+        return sessions
 
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[Session]:
         result = await self.db_session.execute(
@@ -69,18 +102,41 @@ class SessionRepository:
         return result.scalars().all()
 
     async def update(self, session_id: int, session_data: SessionUpdate) -> Optional[Session]:
-        session = await self.get_by_id(session_id)
-        if session:
-            for field, value in session_data.dict(exclude_unset=True).items():
-                setattr(session, field, value)
-            await self.db_session.commit()
-            await self.db_session.refresh(session)
+        result = await self.db_session.execute(
+            update(Session)
+            .where(Session.id == session_id)
+            .values(**session_data.dict(exclude_unset=True))
+            .returning(Session)
+            .execution_options(populate_existing=True)
+        )
+        session = result.scalar_one_or_none()
         return session
 
-    async def delete(self, session_id: int) -> bool:
-        session = await self.get_by_id(session_id)
-        if session:
-            await self.db_session.delete(session)
-            await self.db_session.commit()
-            return True
-        return False
\ No newline at end of file
+    async def reserve(self, session_id: int) -> int:
+        # Claims the session in one statement; 0 means it is taken or missing
+        result = await self.db_session.execute(
+            update(Session)
+            .where(Session.id == session_id)
+            .where(Session.is_available == True)
+            .values(is_available=False)
+        )
+        return result.rowcount
+
+    async def delete(self, session_id: int) -> int:
+        result = await self.db_session.execute(
+            delete(Session).where(Session.id == session_id)
+        )
+        return result.rowcount
+
+    async def archive_batch(self, cutoff: datetime, batch_size: int) -> int:
+        # Past sessions that were never booked, or whose appointment has
+        # already been archived
+        result = await self.db_session.execute(
+            self._archivable_ids(
+                select(Session.id)
+                .where(Session.end_time < cutoff)
+                .where(~exists().where(Appointment.session_id == Session.id))
+            )
+            .limit(batch_size)
+        )
+        return await self._move_to_archive(result.scalars().all())
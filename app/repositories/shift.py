@@ -1,26 +1,32 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, update
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from app.models.shift import Shift
+from app.repositories.base import BaseRepository
 from app.schemes.shift import ShiftCreate, ShiftUpdate
 from datetime import datetime
 
 
-class ShiftRepository:
+class ShiftRepository(BaseRepository):
+    model = Shift
+
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
     async def create(self, shift_data: ShiftCreate) -> Shift:
-        shift = Shift(
-            master_id=shift_data.master_id,
-            date=shift_data.date,
-            start_time=shift_data.start_time,
-            end_time=shift_data.end_time
+        result = await self.db_session.execute(
+            insert(Shift)
+            .values(
+                master_id=shift_data.master_id,
+                date=shift_data.date,
+                start_time=shift_data.start_time,
+                end_time=shift_data.end_time
+            )
+            .returning(Shift)
         )
-        self.db_session.add(shift)
-        await self.db_session.commit()
-        await self.db_session.refresh(shift)
+        shift = result.scalar_one()
         return shift
 
     async def get_by_id(self, shift_id: int) -> Optional[Shift]:
@@ -59,18 +65,18 @@ class ShiftRepository:
         return result.scalars().all()
 
     async def update(self, shift_id: int, shift_data: ShiftUpdate) -> Optional[Shift]:
-        shift = await self.get_by_id(shift_id)
-        if shift:
-            for field, value in shift_data.dict(exclude_unset=True).items():
-                setattr(shift, field, value)
-            await self.db_session.commit()
-            await self.db_session.refresh(shift)
+        result = await self.db_session.execute(
+            update(Shift)
+            .where(Shift.id == shift_id)
+            .values(**shift_data.dict(exclude_unset=True))
+            .returning(Shift)
+            .execution_options(populate_existing=True)
+        )
+        shift = result.scalar_one_or_none()
         return shift
 
-    async def delete(self, shift_id: int) -> bool:
-        shift = await self.get_by_id(shift_id)
-        if shift:
-            await self.db_session.delete(shift)
-            await self.db_session.commit()
-            return True
-        return False
\ No newline at end of file
+    async def delete(self, shift_id: int) -> int:
+        result = await self.db_session.execute(
+            delete(Shift).where(Shift.id == shift_id)
+        )
+        return result.rowcount
\ No newline at end of file
@@ -1,25 +1,40 @@
-from typing import List, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, delete, func, insert, update
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from app.database.after_commit import after_commit
 from app.models.user import User
+from app.repositories.base import BaseRepository
 from app.schemes.user import UserCreate, UserUpdate
+from app.utils.principal_cache import invalidate_principal
+from app.utils.revocation import revoked_claims
+from app.utils.table_versions import mark_changed
 
 
-class UserRepository:
+_select_by_username = select(User).where(User.username == bindparam("username"))
+
+
+class UserRepository(BaseRepository):
+    model = User
+    upsert_key = "username"
+
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
     async def create(self, user_data: UserCreate) -> User:
-        user = User(
-            username=user_data.username,
-            email=user_data.email,
-            password_hash=user_data.password,
-            role=user_data.role
+        result = await self.db_session.execute(
+            insert(User)
+            .values(
+                username=user_data.username,
+                email=user_data.email,
+                password_hash=user_data.password,
+                role=user_data.role
+            )
+            .returning(User)
         )
-        self.db_session.add(user)
-        await self.db_session.commit()
-        await self.db_session.refresh(user)
+        user = result.scalar_one()
         return user
 
     async def get_by_id(self, user_id: int) -> Optional[User]:
@@ -31,9 +46,7 @@ class UserRepository:
         return result.scalar_one_or_none()
 
     async def get_by_username(self, username: str) -> Optional[User]:
-        result = await self.db_session.execute(
-            select(User).where(User.username == username)
-        )
+        result = await self.db_session.execute(_select_by_username, {"username": username})
         return result.scalar_one_or_none()
 
     async def get_by_email(self, email: str) -> Optional[User]:
@@ -52,18 +65,47 @@ class UserRepository:
         return result.scalars().all()
 
     async def update(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
-        user = await self.get_by_id(user_id)
+        changes = user_data.dict(exclude_unset=True)
+        result = await self.db_session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(**changes)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        user = result.scalar_one_or_none()
         if user:
-            for field, value in user_data.dict(exclude_unset=True).items():
-                setattr(user, field, value)
-            await self.db_session.commit()
-            await self.db_session.refresh(user)
+            after_commit(self.db_session, partial(invalidate_principal, user_id))
+            # Tokens issued before this change carry stale claims
+            if changes.keys() & {"username", "role", "is_active"}:
+                after_commit(self.db_session, partial(revoked_claims.revoke, user_id))
         return user
 
-    async def delete(self, user_id: int) -> bool:
-        user = await self.get_by_id(user_id)
-        if user:
-            await self.db_session.delete(user)
-            await self.db_session.commit()
-            return True
-        return False
\ No newline at end of file
+    async def upsert_many(self, rows: List[Dict[str, Any]]) -> None:
+        # Existing users imported without a password keep theirs. SQLite
+        # checks NOT NULL before ON CONFLICT, so they are updated separately.
+        with_password = [row for row in rows if row["password_hash"] is not None]
+        without_password = [row for row in rows if row["password_hash"] is None]
+        if with_password:
+            await super().upsert_many(with_password)
+        if without_password:
+            table = User.__table__
+            columns = [name for name in without_password[0] if name not in ("id", "username", "password_hash")]
+            await self.db_session.execute(
+                update(table)
+                .where(table.c.username == bindparam("b_username"))
+                .values({**{name: bindparam(f"b_{name}") for name in columns}, "updated_at": func.now()}),
+                [{f"b_{name}": value for name, value in row.items()} for row in without_password],
+            )
+
+    async def delete(self, user_id: int) -> int:
+        # Master profile, appointments and reviews go with it (ON DELETE CASCADE)
+        result = await self.db_session.execute(
+            delete(User).where(User.id == user_id)
+        )
+        if result.rowcount:
+            after_commit(self.db_session, partial(invalidate_principal, user_id))
+            after_commit(self.db_session, partial(revoked_claims.revoke, user_id))
+            # The cascade may have removed a master profile
+            mark_changed(self.db_session, "masters")
+        return result.rowcount
\ No newline at end of file
@@ -1,10 +1,11 @@
-from .user import UserBase, UserCreate, UserUpdate, UserInDB, UserLogin, Token, TokenData
+from .user import UserBase, UserCreate, UserUpdate, UserInDB, UserLogin, Token, TokenData, UserClaims
 from .master import MasterBase, MasterCreate, MasterUpdate, MasterInDB
 from .service import ServiceBase, ServiceCreate, ServiceUpdate, ServiceInDB
 from .session import SessionBase, SessionCreate, SessionUpdate, SessionInDB
 from .appointment import AppointmentBase, AppointmentCreate, AppointmentUpdate, AppointmentInDB
 from .review import ReviewBase, ReviewCreate, ReviewUpdate, ReviewInDB
 from .shift import ShiftBase, ShiftCreate, ShiftUpdate, ShiftInDB
+from .bulk_import import UserImport, MasterImport, ServiceImport, SessionImport, ImportRowResult, ImportResult
 
 __all__ = [
     "UserBase",
@@ -14,6 +15,7 @@ __all__ = [
     "UserLogin",
     "Token",
     "TokenData",
+    "UserClaims",
     "MasterBase",
     "MasterCreate",
     "MasterUpdate",
@@ -37,5 +39,11 @@ __all__ = [
     "ShiftBase",
     "ShiftCreate",
     "ShiftUpdate",
-    "ShiftInDB"
+    "ShiftInDB",
+    "UserImport",
+    "MasterImport",
+    "ServiceImport",
+    "SessionImport",
+    "ImportRowResult",
+    "ImportResult"
 ]
\ No newline at end of file
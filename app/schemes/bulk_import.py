@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from app.schemes.user import UserBase
+from app.schemes.master import MasterBase
+from app.schemes.service import ServiceBase
+from app.schemes.session import SessionBase
+
+
+# Rows with an id update that row (or create it with that id); rows
+# without one are created. Users are matched by username instead.
+class UserImport(UserBase):
+    password: Optional[str] = None
+    # Already hashed with bcrypt, e.g. when moving users between systems
+    password_hash: Optional[str] = None
+
+
+class MasterImport(MasterBase):
+    id: Optional[int] = None
+
+
+class ServiceImport(ServiceBase):
+    id: Optional[int] = None
+
+
+class SessionImport(SessionBase):
+    id: Optional[int] = None
+
+
+class ImportRowResult(BaseModel):
+    row: int
+    status: Literal["created", "updated", "failed"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ImportResult(BaseModel):
+    entity: str
+    created: int
+    updated: int
+    failed: int
+    rows: List[ImportRowResult]
@@ -41,4 +41,11 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     username: Optional[str] = None
     user_id: Optional[int] = None
-    role: Optional[str] = None
\ No newline at end of file
+    role: Optional[str] = None
+    issued_at: Optional[int] = None
+
+
+class UserClaims(BaseModel):
+    id: int
+    username: str
+    role: str
\ No newline at end of file
@@ -39,7 +39,7 @@ class AdminService:
             raise ValueError("Service not found")
         return await self.service_repository.update(service_id, service_update)
 
-    async def delete_service(self, service_id: int) -> bool:
+    async def delete_service(self, service_id: int) -> int:
         return await self.service_repository.delete(service_id)
 
     async def get_services(self, skip: int = 0, limit: int = 100) -> List[ServiceInDB]:
@@ -58,7 +58,7 @@ class AdminService:
             raise ValueError("Master not found")
         return await self.master_repository.update(master_id, master_update)
 
-    async def delete_master(self, master_id: int) -> bool:
+    async def delete_master(self, master_id: int) -> int:
         return await self.master_repository.delete(master_id)
 
     async def get_masters(self, skip: int = 0, limit: int = 100) -> List[MasterInDB]:
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+from typing import Dict
+from app.database.db_manager import DBManager
+from app.database.writer import WriteQueue
+
+
+class ArchiveService:
+    """Moves finished history out of the hot tables.
+
+    Completed or cancelled appointments whose session ended before the
+    horizon go to appointments_archive, then past sessions without a hot
+    appointment go to sessions_archive. Every batch is its own write-queue
+    job, so other writes wait for one batch at most, not the whole run.
+    """
+
+    def __init__(self, writer: WriteQueue):
+        self.writer = writer
+
+    async def archive(self, horizon_days: int, batch_size: int) -> Dict[str, int]:
+        cutoff = datetime.now() - timedelta(days=horizon_days)
+        moved = {}
+        # Appointments first: archiving them frees their sessions
+        for repository in ("appointments", "sessions"):
+            moved[repository] = 0
+            while True:
+                count = await self.writer.submit(
+                    lambda db, repository=repository: self._archive_batch(db, repository, cutoff, batch_size)
+                )
+                moved[repository] += count
+                if count < batch_size:
+                    break
+        return moved
+
+    @staticmethod
+    async def _archive_batch(db: DBManager, repository: str, cutoff: datetime, batch_size: int) -> int:
+        return await getattr(db, repository).archive_batch(cutoff, batch_size)
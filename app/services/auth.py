@@ -1,35 +1,56 @@
 from datetime import datetime, timedelta
 from typing import Optional
-import bcrypt
 import jwt
 from app.config import settings
 from app.repositories.user import UserRepository
 from app.schemes.user import UserInDB, TokenData
+from app.utils.worker_pool import BoundedWorkerPool
+
+
+# bcrypt takes 100-300 ms per call and releases the GIL, so it runs here
+# instead of on the event loop.
+password_pool = BoundedWorkerPool(
+    "password-hash",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+# bcrypt is imported on first use to keep it out of startup
+def _checkpw(plain_password: str, hashed_password: str) -> bool:
+    import bcrypt
+    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def _hashpw(password: str) -> str:
+    import bcrypt
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
 
 class AuthService:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await password_pool.run(_checkpw, plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    async def get_password_hash(self, password: str) -> str:
+        return await password_pool.run(_hashpw, password)
 
     async def authenticate_user(self, username: str, password: str) -> Optional[UserInDB]:
         user = await self.user_repository.get_by_username(username)
-        if not user or not self.verify_password(password, user.password_hash):
+        if not user or not await self.verify_password(password, user.password_hash):
             return None
         return user
 
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         to_encode = data.copy()
+        now = datetime.utcnow()
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.utcnow() + timedelta(minutes=15)
-        to_encode.update({"exp": expire})
+            expire = now + timedelta(minutes=15)
+        to_encode.update({"exp": expire, "iat": now})
         encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
         return encoded_jwt
 
@@ -41,7 +62,7 @@ class AuthService:
             role: str = payload.get("role")
             if username is None or user_id is None or role is None:
                 return None
-            token_data = TokenData(username=username, user_id=user_id, role=role)
+            token_data = TokenData(username=username, user_id=user_id, role=role, issued_at=payload.get("iat"))
             return token_data
         except jwt.PyJWTError:
             return None
\ No newline at end of file
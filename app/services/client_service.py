@@ -9,7 +9,7 @@ from app.repositories.review import ReviewRepository
 from app.schemes.user import UserInDB
 from app.schemes.service import ServiceInDB
 from app.schemes.master import MasterInDB
-from app.schemes.session import SessionInDB, SessionUpdate
+from app.schemes.session import SessionInDB
 from app.schemes.appointment import AppointmentCreate, AppointmentInDB
 from app.schemes.review import ReviewCreate, ReviewInDB
 
@@ -51,19 +51,12 @@ class ClientService:
         if appointment_data.client_id != current_user.id:
             raise ValueError("Cannot book appointment for another user")
         
-        # Check if session exists and is available
-        session = await self.session_repository.get_by_id(appointment_data.session_id)
-        if not session or not session.is_available:
+        # Mark the session as taken if it exists and is available
+        if not await self.session_repository.reserve(appointment_data.session_id):
             raise ValueError("Session is not available")
         
         # Create the appointment
-        appointment = await self.appointment_repository.create(appointment_data)
-        
-        # Update session availability
-        session_update = SessionUpdate(is_available=False)
-        await self.session_repository.update(session.id, session_update)
-        
-        return appointment
+        return await self.appointment_repository.create(appointment_data)
 
     async def get_my_appointments(self, current_user: UserInDB) -> List[AppointmentInDB]:
         return await self.appointment_repository.get_by_client_id(current_user.id)
@@ -0,0 +1,184 @@
+import asyncio
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+from app.config import settings
+from app.database.after_commit import after_commit
+from app.database.db_manager import DBManager
+from app.database.writer import WriteQueue
+from app.schemes.bulk_import import (
+    UserImport,
+    MasterImport,
+    ServiceImport,
+    SessionImport,
+    ImportRowResult,
+    ImportResult,
+)
+from app.services.auth import AuthService, password_pool
+from app.utils.principal_cache import invalidate_principal
+from app.utils.revocation import revoked_claims
+
+
+# entity -> (row schema, DBManager repository attribute)
+IMPORT_ENTITIES: Dict[str, Tuple[Type[BaseModel], str]] = {
+    "users": (UserImport, "users"),
+    "masters": (MasterImport, "masters"),
+    "services": (ServiceImport, "services"),
+    "sessions": (SessionImport, "sessions"),
+}
+
+
+def _row_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+        )
+    if isinstance(error, IntegrityError):
+        return str(error.orig)
+    return str(error)
+
+
+class ImportService:
+    """Bulk upsert of admin imports.
+
+    Rows are validated and passwords hashed before anything touches the
+    database. Valid rows are then written by a single write-queue job, one
+    executemany per chunk. If a chunk violates a constraint, it is redone
+    row by row in savepoints so only the offending rows fail.
+    """
+
+    def __init__(self, writer: WriteQueue):
+        self.writer = writer
+
+    async def import_rows(self, entity: str, raw_rows: List[Dict[str, Any]]) -> ImportResult:
+        schema, repository = IMPORT_ENTITIES[entity]
+        results: List[Optional[ImportRowResult]] = [None] * len(raw_rows)
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+
+        for index, raw in enumerate(raw_rows):
+            try:
+                valid.append((index, schema.model_validate(raw).model_dump()))
+            except ValidationError as error:
+                results[index] = ImportRowResult(row=index, status="failed", error=_row_error(error))
+
+        if entity == "users":
+            await self._hash_passwords(valid)
+
+        if valid:
+            written = await self.writer.submit(lambda db: self._upsert(db, repository, valid))
+            for result in written:
+                results[result.row] = result
+            self._invalidate_caches(entity, written)
+
+        rows = [result for result in results if result is not None]
+        return ImportResult(
+            entity=entity,
+            created=sum(result.status == "created" for result in rows),
+            updated=sum(result.status == "updated" for result in rows),
+            failed=sum(result.status == "failed" for result in rows),
+            rows=rows,
+        )
+
+    async def _hash_passwords(self, rows: List[Tuple[int, Dict[str, Any]]]) -> None:
+        # Keep at most one job per worker in the pool so logins are not
+        # turned away while an import is hashing.
+        semaphore = asyncio.Semaphore(password_pool.max_workers)
+        auth_service = AuthService(None)
+
+        async def hash_row(row: Dict[str, Any]) -> None:
+            password = row.pop("password", None)
+            if password is not None:
+                async with semaphore:
+                    row["password_hash"] = await auth_service.get_password_hash(password)
+
+        await asyncio.gather(*(hash_row(row) for _, row in rows))
+
+    async def _upsert(
+        self, db: DBManager, repository: str, rows: List[Tuple[int, Dict[str, Any]]]
+    ) -> List[ImportRowResult]:
+        repo = getattr(db, repository)
+        key = repo.upsert_key
+        schema = IMPORT_ENTITIES[repository][0]
+        # Columns the import does not cover keep their table defaults on
+        # insert and their current values on update.
+        columns = ["id"] + [name for name in schema.model_fields if name not in ("id", "password")]
+        next_id = await repo.next_id()
+        seen = set()
+        results = []
+
+        chunk_size = settings.BULK_IMPORT_CHUNK_SIZE
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            existing = await repo.get_ids_by_key(row[key] for _, row in chunk if row.get(key) is not None)
+
+            payloads, chunk_results = [], []
+            for index, row in chunk:
+                row_key = row.get(key)
+                if key != "id" and row_key in existing:
+                    row["id"] = existing[row_key]
+                if row.get("id") is None:
+                    row["id"] = next_id
+                    next_id += 1
+                else:
+                    next_id = max(next_id, row["id"] + 1)
+                row_key = row[key]
+
+                updated = row_key in existing or row_key in seen
+                if not updated and repository == "users" and row.get("password_hash") is None:
+                    results.append(ImportRowResult(row=index, status="failed", error="password: required for new users"))
+                    continue
+                seen.add(row_key)
+                payloads.append({column: row.get(column) for column in columns})
+                chunk_results.append(ImportRowResult(row=index, status="updated" if updated else "created", id=row["id"]))
+
+            if not payloads:
+                continue
+            # Users of the masters before the import, to invalidate them once written
+            previous = await repo.get_user_ids(existing.values()) if repository == "masters" else None
+            try:
+                async with db.session.begin_nested():
+                    await repo.upsert_many(payloads)
+            except IntegrityError:
+                chunk_results = await self._upsert_one_by_one(db, repo, payloads, chunk_results, previous)
+            else:
+                self._invalidate_masters(db, payloads, previous)
+            results.extend(chunk_results)
+
+        return results
+
+    @staticmethod
+    async def _upsert_one_by_one(
+        db: DBManager, repo, payloads, chunk_results, previous: Optional[Dict[int, int]]
+    ) -> List[ImportRowResult]:
+        results = []
+        for payload, result in zip(payloads, chunk_results):
+            try:
+                async with db.session.begin_nested():
+                    await repo.upsert_many([payload])
+            except IntegrityError as error:
+                result = ImportRowResult(row=result.row, status="failed", error=_row_error(error))
+            else:
+                ImportService._invalidate_masters(db, [payload], previous)
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _invalidate_masters(db: DBManager, payloads, previous: Optional[Dict[int, int]]) -> None:
+        if previous is None:
+            return
+        # A master moved to another user changes both principals
+        user_ids = {payload["user_id"] for payload in payloads}
+        user_ids.update(previous[payload["id"]] for payload in payloads if payload["id"] in previous)
+        for user_id in user_ids:
+            after_commit(db.session, partial(invalidate_principal, user_id))
+
+    @staticmethod
+    def _invalidate_caches(entity: str, written: List[ImportRowResult]) -> None:
+        # Masters are invalidated by the write job, which knows their
+        # previous users
+        if entity == "users":
+            for result in written:
+                if result.status == "updated":
+                    invalidate_principal(result.id)
+                    revoked_claims.revoke(result.id)
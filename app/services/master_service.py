@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.user import UserRepository
 from app.repositories.master import MasterRepository
@@ -10,6 +10,7 @@ from app.schemes.master import MasterInDB
 from app.schemes.session import SessionUpdate, SessionInDB
 from app.schemes.appointment import AppointmentInDB, AppointmentUpdate
 from app.schemes.review import ReviewInDB
+from app.utils.principal_cache import principal_cache
 
 
 class MasterService:
@@ -27,6 +28,15 @@ class MasterService:
         self.appointment_repository = appointment_repository
         self.review_repository = review_repository
 
+    async def _get_master_id(self, current_user: UserInDB) -> Optional[int]:
+        # get_current_user has usually resolved the master profile already
+        principal = principal_cache.get(current_user.id)
+        if principal is not None and principal.master_id is not None:
+            return principal.master_id
+
+        master = await self.master_repository.get_by_user_id(current_user.id)
+        return master.id if master else None
+
     async def get_master_profile(self, current_user: UserInDB) -> MasterInDB:
         master = await self.master_repository.get_by_user_id(current_user.id)
         if not master:
@@ -40,18 +50,18 @@ class MasterService:
         except ValueError:
             raise ValueError("Invalid date format. Use YYYY-MM-DD")
         
-        master = await self.master_repository.get_by_user_id(current_user.id)
-        if not master:
+        master_id = await self._get_master_id(current_user)
+        if master_id is None:
             raise ValueError("Master profile not found")
         
-        return await self.session_repository.get_by_master_and_date(master.id, date_obj)
+        return await self.session_repository.get_by_master_and_date(master_id, date_obj)
 
     async def get_master_appointments(self, current_user: UserInDB) -> List[AppointmentInDB]:
-        master = await self.master_repository.get_by_user_id(current_user.id)
-        if not master:
+        master_id = await self._get_master_id(current_user)
+        if master_id is None:
             raise ValueError("Master profile not found")
         
-        return await self.appointment_repository.get_by_master_id(master.id)
+        return await self.appointment_repository.get_by_master_id(master_id)
 
     async def update_session_availability(self, session_id: int, session_update: SessionUpdate, current_user: UserInDB) -> SessionInDB:
         session = await self.session_repository.get_by_id(session_id)
@@ -59,8 +69,8 @@ class MasterService:
             raise ValueError("Session not found")
         
         # Verify that the session belongs to the current master
-        master = await self.master_repository.get_by_user_id(current_user.id)
-        if not master or session.master_id != master.id:
+        master_id = await self._get_master_id(current_user)
+        if master_id is None or session.master_id != master_id:
             raise ValueError("Not authorized to update this session")
         
         # Update session availability
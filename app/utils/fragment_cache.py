@@ -0,0 +1,40 @@
+from typing import Awaitable, Callable, Dict, Sequence, Tuple
+
+from markupsafe import Markup
+
+from app.utils.metrics import track_cache
+from app.utils.table_versions import table_versions
+
+
+class FragmentCache:
+    """Rendered HTML fragments, each kept for the table versions it shows.
+
+    An entry stays valid until one of its tables is written, so a hit needs
+    no query at all. Like the versions themselves the cache is per process.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[Tuple[int, ...], Markup]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, name: str, tables: Sequence[str], render: Callable[[], Awaitable[str]]) -> Markup:
+        # Versions are read before rendering: a write committed meanwhile
+        # leaves newer HTML under the older version, which the next request
+        # simply renders again.
+        versions = tuple(table_versions.get(table) for table in tables)
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == versions:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        html = Markup(await render())
+        self._entries[name] = (versions, html)
+        return html
+
+
+fragment_cache = FragmentCache()
+track_cache("fragments", fragment_cache)
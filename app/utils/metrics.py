@@ -0,0 +1,220 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+# Seconds; covers cached reads (sub-millisecond) up to bcrypt-bound logins
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    """Bucket counts are kept per bucket and only made cumulative on render,
+    so ``observe`` is one bisect and two additions."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket..., count above the last bucket, sum]
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> Iterator[str]:
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(series[-1])}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class CallbackMetric(Metric):
+    """Values read from existing stats objects at scrape time."""
+
+    def __init__(
+        self, name: str, documentation: str, kind: str, labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[Labels, float]]],
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.callback = callback
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in self.callback():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge_callback(
+        self, name: str, documentation: str, labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[Labels, float]]],
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, "gauge", labelnames, callback))
+
+    def counter_callback(
+        self, name: str, documentation: str, labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[Labels, float]]],
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, "counter", labelnames, callback))
+
+    def render(self) -> str:
+        """Prometheus text exposition format, version 0.0.4."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last response byte.",
+    ("router", "method", "route", "status"),
+)
+event_loop_lag = registry.histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke a sleeping task; high values mean the loop is saturated.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+bookings = registry.counter(
+    "app_bookings_total",
+    "Booking attempts by result; 'unavailable' is a session that was already taken.",
+    ("result",),
+)
+rate_limited = registry.counter(
+    "app_rate_limited_total", "Requests rejected with 429 by the rate limiter.", ("route",)
+)
+
+# name -> cache with ``hits``/``misses`` counters and a length, e.g. TTLCache
+_caches: Dict[str, object] = {}
+
+
+def track_cache(name: str, cache) -> None:
+    _caches[name] = cache
+
+
+registry.counter_callback(
+    "app_cache_hits_total", "Cache lookups that found a live entry.", ("cache",),
+    lambda: [((name,), cache.hits) for name, cache in _caches.items()],
+)
+registry.counter_callback(
+    "app_cache_misses_total", "Cache lookups that missed or found an expired entry.", ("cache",),
+    lambda: [((name,), cache.misses) for name, cache in _caches.items()],
+)
+registry.gauge_callback(
+    "app_cache_hit_ratio", "Hits over lookups since start.", ("cache",),
+    lambda: [((name,), cache.hits / ((cache.hits + cache.misses) or 1)) for name, cache in _caches.items()],
+)
+registry.gauge_callback(
+    "app_cache_entries", "Entries currently held.", ("cache",),
+    lambda: [((name,), len(cache)) for name, cache in _caches.items()],
+)
+
+
+class EventLoopMonitor:
+    """Sleeps for ``interval`` seconds in a loop and records the overshoot."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            event_loop_lag.observe(max(time.perf_counter() - started - self.interval, 0.0))
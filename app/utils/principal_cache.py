@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import settings
+from app.schemes.user import UserInDB
+from app.utils.cache import TTLCache
+from app.utils.metrics import track_cache
+
+
+@dataclass(frozen=True)
+class Principal:
+    user: UserInDB
+    master_id: Optional[int] = None
+
+
+# Keyed by user id. Entries are dropped by UserRepository and MasterRepository
+# once an update/delete commits; the TTL bounds staleness between worker
+# processes.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+track_cache("principal", principal_cache)
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.pop(user_id)
@@ -0,0 +1,104 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Iterable, Optional, Tuple
+
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Rate:
+    capacity: int
+    period: float
+
+    @property
+    def per_second(self) -> float:
+        return self.capacity / self.period
+
+
+def parse_rate(value: str) -> Optional[Rate]:
+    """Parse ``"<count>/<second|minute|hour|day>"``; an empty value disables the limit."""
+    if not value:
+        return None
+    count, _, period = value.partition("/")
+    if period not in PERIODS or not count.strip().isdigit() or int(count) < 1:
+        raise ValueError(f"Invalid rate {value!r}, expected e.g. '10/minute'")
+    return Rate(capacity=int(count), period=PERIODS[period])
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    """Token buckets kept in a bounded LRU map.
+
+    A bucket left alone for a full period is back to capacity, which is the
+    same as not having one, so idle buckets are the first to be evicted when
+    ``max_keys`` is reached.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.rejected = 0
+        self._buckets: "OrderedDict[Hashable, _Bucket]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _bucket(self, key: Hashable, rate: Rate, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(rate.capacity, now)
+            self._buckets[key] = bucket
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            bucket.tokens = min(rate.capacity, bucket.tokens + (now - bucket.updated) * rate.per_second)
+            bucket.updated = now
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def acquire(self, limits: Iterable[Tuple[Hashable, Rate]]) -> float:
+        """Take one token from every bucket, or none if any of them is empty.
+
+        Returns 0 when the request may proceed, otherwise the number of
+        seconds until it would be allowed.
+        """
+        now = time.monotonic()
+        buckets = [(self._bucket(key, rate, now), rate) for key, rate in limits]
+        waits = [(1 - bucket.tokens) / rate.per_second for bucket, rate in buckets if bucket.tokens < 1]
+        if waits:
+            self.rejected += 1
+            return max(waits)
+        for bucket, _ in buckets:
+            bucket.tokens -= 1
+        return 0.0
+
+
+class RouteRateLimit:
+    def __init__(self, route: str, per_ip: str = "", per_user: str = "", per_route: str = ""):
+        self.route = route
+        self.per_ip = parse_rate(per_ip)
+        self.per_user = parse_rate(per_user)
+        self.per_route = parse_rate(per_route)
+
+    def limits(self, ip: Optional[str], user: Optional[Hashable]) -> list:
+        limits = []
+        if self.per_route:
+            limits.append(((self.route,), self.per_route))
+        if self.per_ip and ip:
+            limits.append(((self.route, "ip", ip), self.per_ip))
+        if self.per_user and user is not None:
+            limits.append(((self.route, "user", user), self.per_user))
+        return limits
+
+
+def retry_after_header(wait: float) -> str:
+    return str(max(1, math.ceil(wait)))
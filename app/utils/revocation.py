@@ -0,0 +1,49 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import settings
+
+
+class RevocationList:
+    """Users whose token claims must not be trusted any more.
+
+    An entry only has to outlive the tokens issued before it, so it is
+    dropped after ``retention`` seconds (the access token lifetime).
+    Entries are kept in revocation order, so the expired ones are always
+    at the front and purging never walks the live ones.
+    """
+
+    def __init__(self, retention: float):
+        self.retention = retention
+        self._revoked: "OrderedDict[int, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def revoke(self, user_id: int) -> None:
+        now = time.time()
+        self._revoked[user_id] = now
+        self._revoked.move_to_end(user_id)
+        self._purge(now)
+
+    def is_revoked(self, user_id: int, issued_at: Optional[int]) -> bool:
+        revoked_at = self._revoked.get(user_id)
+        if revoked_at is None:
+            return False
+        if time.time() - revoked_at > self.retention:
+            del self._revoked[user_id]
+            return False
+        # iat has one second resolution, so a token issued in the same second
+        # as the revocation is treated as revoked too.
+        return issued_at is None or issued_at <= revoked_at
+
+    def _purge(self, now: float) -> None:
+        while self._revoked:
+            user_id, revoked_at = next(iter(self._revoked.items()))
+            if now - revoked_at <= self.retention:
+                break
+            del self._revoked[user_id]
+
+
+revoked_claims = RevocationList(retention=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
@@ -0,0 +1,118 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+# Field types orjson encodes exactly like pydantic's JSON mode
+_SCALARS = (int, float, str, bool, datetime)
+
+
+def parse_fields(schema: Type[BaseModel], value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """``fields=id,name,price`` -> the named fields in schema order.
+
+    None (everything) when the parameter is missing or empty; ValueError
+    for names the schema does not have.
+    """
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(schema.model_fields)}"
+        )
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def schema_subset(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    # A model with only the requested fields, so neither path below reads
+    # attributes the repository did not load.
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    # Building the core schema of List[schema] costs more than serializing
+    # a short list, so each adapter is built once per schema.
+    return TypeAdapter(List[schema])
+
+
+@lru_cache(maxsize=None)
+def trusted_fields(schema: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """Field names of ``schema`` if every field is a plain scalar.
+
+    None when a field needs pydantic to be encoded (nested models,
+    constraints, aliases, ...).
+    """
+    for name, field in schema.model_fields.items():
+        annotation = field.annotation
+        if get_origin(annotation) is Union:
+            arguments = [argument for argument in get_args(annotation) if argument is not type(None)]
+            annotation = arguments[0] if len(arguments) == 1 else None
+        if annotation not in _SCALARS or field.metadata or field.alias not in (None, name):
+            return None
+    return tuple(schema.model_fields)
+
+
+def _row_values(row: Any, fields: Tuple[str, ...]) -> dict:
+    state = row.__dict__
+    try:
+        return {name: state[name] for name in fields}
+    except KeyError:
+        # An attribute that was never loaded; let the ORM fetch it
+        return {name: getattr(row, name) for name in fields}
+
+
+def json_list(
+    schema: Type[BaseModel],
+    rows: Iterable[Any],
+    validate: bool = False,
+    fields: Optional[Sequence[str]] = None,
+) -> Response:
+    """Serialize repository output straight to JSON bytes.
+
+    Rows from our own repositories are trusted: their loaded column values
+    are taken from the instance state and encoded by orjson, without
+    building a pydantic model per row. ``validate=True`` (and any schema
+    that is not flat) goes through a cached TypeAdapter instead. Either
+    way, returning a Response makes FastAPI skip its own validation against
+    the route's response_model, which is still declared for OpenAPI.
+    ``fields`` (see parse_fields) limits the output to those fields.
+    """
+    if fields:
+        schema = schema_subset(schema, tuple(fields))
+    names = None if validate else trusted_fields(schema)
+    if names is None:
+        adapter = list_adapter(schema)
+        content = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    else:
+        content = orjson.dumps([_row_values(row, names) for row in rows])
+    return Response(content, media_type="application/json")
+
+
+def json_object(
+    schema: Type[BaseModel],
+    row: Any,
+    validate: bool = False,
+    fields: Optional[Sequence[str]] = None,
+) -> Response:
+    """json_list() for a single row."""
+    if fields:
+        schema = schema_subset(schema, tuple(fields))
+    names = None if validate else trusted_fields(schema)
+    if names is None:
+        content = schema.model_validate(row, from_attributes=True).model_dump_json().encode()
+    else:
+        content = orjson.dumps(_row_values(row, names))
+    return Response(content, media_type="application/json")
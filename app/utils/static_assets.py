@@ -0,0 +1,156 @@
+"""Fingerprinted, precompressed static files.
+
+    python -m app.utils.static_assets
+
+copies every file in STATIC_DIR to ``<STATIC_DIR>/dist`` under a name that
+carries a hash of its content (css/style.css -> css/style.1a2b3c4d5e6f.css),
+writes .gz (and .br, with the optional brotli package) next to the text
+files and records the mapping in dist/manifest.json. Templates link files
+through ``static_url()``, so a new build changes the URLs and the hashed
+files can be cached forever. Without a build, static_url() falls back to
+the plain file.
+"""
+import gzip
+import hashlib
+import json
+import shutil
+import stat
+import sys
+from functools import cached_property
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from app.config import settings
+from app.utils.compression import accepted_encodings, brotli
+
+BUILD_DIR = "dist"
+MANIFEST = "manifest.json"
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Plain names can change content in place; always revalidate them
+REVALIDATE = "no-cache"
+COMPRESSIBLE = {".css", ".js", ".mjs", ".map", ".svg", ".json", ".txt", ".html", ".xml"}
+
+
+def build(source: Path) -> Dict[str, str]:
+    output = source / BUILD_DIR
+    shutil.rmtree(output, ignore_errors=True)
+    manifest = {}
+    for path in sorted(source.rglob("*")):
+        relative = path.relative_to(source)
+        if not path.is_file() or relative.parts[0] == BUILD_DIR or relative.name.startswith("."):
+            continue
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        hashed = relative.with_name(f"{relative.stem}.{digest}{relative.suffix}").as_posix()
+        target = output / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+
+        if relative.suffix in COMPRESSIBLE:
+            variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants[".br"] = brotli.compress(data, quality=11)
+            for suffix, compressed in variants.items():
+                # Tiny files can grow when compressed
+                if len(compressed) < len(data):
+                    target.with_name(target.name + suffix).write_bytes(compressed)
+        manifest[relative.as_posix()] = hashed
+
+    (output / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    return manifest
+
+
+class StaticAssets:
+    def __init__(self, directory: str, url_prefix: str = "/static"):
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix
+
+    @cached_property
+    def manifest(self) -> Dict[str, str]:
+        # Read once; a new build ships with a restart
+        try:
+            return json.loads((self.directory / BUILD_DIR / MANIFEST).read_text())
+        except FileNotFoundError:
+            return {}
+
+    @cached_property
+    def fingerprinted(self) -> Set[str]:
+        return {f"{BUILD_DIR}/{hashed}" for hashed in self.manifest.values()}
+
+    def url(self, path: str) -> str:
+        hashed = self.manifest.get(path)
+        if hashed is None:
+            return f"{self.url_prefix}/{path}"
+        return f"{self.url_prefix}/{BUILD_DIR}/{hashed}"
+
+
+assets = StaticAssets(settings.STATIC_DIR)
+
+
+def static_url(path: str) -> str:
+    return assets.url(path)
+
+
+class AssetFiles(StaticFiles):
+    """StaticFiles that prefers the precompressed variants of the build.
+
+    Fingerprinted files are served as immutable, everything else must be
+    revalidated (the ETag/Last-Modified of StaticFiles make that a 304).
+    """
+
+    def __init__(self, *, assets: StaticAssets, **kwargs):
+        super().__init__(directory=assets.directory, **kwargs)
+        self.assets = assets
+
+    async def get_response(self, path: str, scope) -> Response:
+        response = await self._precompressed(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            fingerprinted = Path(path).as_posix() in self.assets.fingerprinted
+            response.headers["Cache-Control"] = IMMUTABLE if fingerprinted else REVALIDATE
+            if Path(path).suffix in COMPRESSIBLE:
+                response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    async def _precompressed(self, path: str, scope) -> Optional[Response]:
+        if Path(path).suffix not in COMPRESSIBLE:
+            return None
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                continue
+            response = FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=guess_type(path)[0] or "application/octet-stream",
+                headers={"Content-Encoding": encoding},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+        return None
+
+
+def main() -> int:
+    source = Path(settings.STATIC_DIR)
+    manifest = build(source)
+    for original, hashed in manifest.items():
+        print(f"{original} -> {BUILD_DIR}/{hashed}")
+    if brotli is None:
+        print("brotli is not installed; wrote .gz variants only", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import secrets
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+_CHANGED = "changed_tables"
+
+
+class TableVersions:
+    """Per-table change counters for conditional GETs of the catalogs.
+
+    Repositories mark the tables they write with ``mark_changed``; the
+    counters move once the transaction commits, so a version never names
+    data that could still be rolled back. The counters live in this
+    process only, which is why every ETag also carries a token drawn at
+    startup: another worker (or a restart) never produces a matching tag
+    for different data, it just misses.
+    """
+
+    def __init__(self):
+        self.token = secrets.token_hex(4)
+        self._versions: Dict[str, int] = {}
+
+    def get(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    def bump(self, tables: Iterable[str]) -> None:
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def etag(self, table: str, *params: Any) -> str:
+        # Query parameters select a different body, so they are part of the tag
+        suffix = "".join(f"-{param}" for param in params)
+        return f'"{table}-{self.token}-{self.get(table)}{suffix}"'
+
+
+table_versions = TableVersions()
+
+
+def mark_changed(session, *tables: str) -> None:
+    # Accepts the AsyncSession the repositories hold
+    sync_session = getattr(session, "sync_session", session)
+    sync_session.info.setdefault(_CHANGED, set()).update(tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session: Session) -> None:
+    # Releasing a savepoint sends after_commit too; wait for the real commit
+    if session.in_nested_transaction():
+        return
+    # A savepoint that was rolled back may still have marked its tables; the
+    # extra bump only costs clients one full response.
+    changed = session.info.pop(_CHANGED, None)
+    if changed:
+        table_versions.bump(changed)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_on_rollback(session: Session, transaction: SessionTransaction) -> None:
+    # Only when the root transaction ends: after_rollback also fires for a
+    # savepoint, which must not drop the tables the rest of the transaction
+    # changed. After a commit the set is already gone.
+    if transaction.parent is None:
+        session.info.pop(_CHANGED, None)
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """A 304 response if the client already holds ``etag``, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class PoolSaturatedError(Exception):
+    pass
+
+
+class BoundedWorkerPool:
+    """Thread pool for blocking CPU work with a cap on queued jobs.
+
+    Jobs beyond ``max_workers + max_queue`` are rejected with
+    ``PoolSaturatedError`` instead of piling up behind each other.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Jobs release their slot from the worker thread
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self.pending - self.max_workers, 0)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PoolSaturatedError(f"{self.name} pool is saturated")
+
+        def job():
+            started = time.perf_counter()
+            return fn(*args), started, time.perf_counter()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        submitted = time.perf_counter()
+        future = self._executor.submit(job)
+        with self._lock:
+            self.pending += 1
+        # A cancelled caller leaves the thread running, so the slot is freed
+        # when the job finishes rather than when the await ends
+        future.add_done_callback(self._release)
+        result, started, finished = await asyncio.wrap_future(future)
+
+        self.completed += 1
+        self.total_wait += started - submitted
+        self.total_run += finished - started
+        self.max_latency = max(self.max_latency, finished - submitted)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.completed or 1
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self.pending, self.max_workers),
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait / completed * 1000, 3),
+            "avg_run_ms": round(self.total_run / completed * 1000, 3),
+            "max_latency_ms": round(self.max_latency * 1000, 3),
+        }
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        # A later run() starts a new executor
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
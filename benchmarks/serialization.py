@@ -0,0 +1,111 @@
+"""Cost of encoding a 1,000-item list response, per request.
+
+    python -m benchmarks.serialization [--items 1000] [--requests 200]
+
+Four routes return the same ORM appointments, built in memory so that no
+database time is included:
+
+"default"  FastAPI validates the rows against response_model and encodes
+           them with the stdlib json module (the old behaviour);
+"orjson"   the same validation, encoded by ORJSONResponse (the app default
+           for routes that return models or dicts);
+"adapter"  json_list(validate=True): the rows are validated and dumped by a
+           cached TypeAdapter and returned as a Response, so FastAPI does
+           not validate them a second time;
+"trusted"  json_list() as the routes use it: loaded column values are
+           encoded by orjson without building a model per row.
+
+The four bodies are checked to be identical before timing.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime
+from typing import List
+
+os.environ.setdefault("DB_NAME", ":memory:")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.models import Appointment  # noqa: E402
+from app.schemes.appointment import AppointmentInDB  # noqa: E402
+from app.utils.serialization import json_list  # noqa: E402
+
+PATHS = ("/default", "/orjson", "/adapter", "/trusted")
+
+
+def make_rows(count: int) -> List[Appointment]:
+    now = datetime(2026, 1, 1, 10, 30, 15, 250000)
+    return [
+        Appointment(
+            id=index, client_id=index % 50, session_id=index, service_id=index % 7,
+            master_id=index % 11, status="booked", created_at=now, updated_at=now,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def make_app(rows: List[Appointment]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=List[AppointmentInDB], response_class=JSONResponse)
+    async def default():
+        return rows
+
+    @app.get("/orjson", response_model=List[AppointmentInDB], response_class=ORJSONResponse)
+    async def orjson():
+        return rows
+
+    @app.get("/adapter", response_model=List[AppointmentInDB])
+    async def adapter():
+        return json_list(AppointmentInDB, rows, validate=True)
+
+    @app.get("/trusted", response_model=List[AppointmentInDB])
+    async def trusted():
+        return json_list(AppointmentInDB, rows)
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> List[float]:
+    await client.get(path)  # warm up adapters and route caches
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return timings
+
+
+async def main(args) -> None:
+    rows = make_rows(args.items)
+    app = make_app(rows)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        bodies = [(await client.get(path)).json() for path in PATHS]
+        assert all(body == bodies[0] for body in bodies), "responses differ"
+
+        print(f"{args.items} appointments, {args.requests} requests each")
+        print(f"{'route':<12} {'median ms':>10} {'p95 ms':>10} {'speedup':>8}")
+        baseline = None
+        for path in PATHS:
+            timings = sorted(await measure(client, path, args.requests))
+            median = statistics.median(timings)
+            baseline = baseline or median
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{path[1:]:<12} {median:>10.2f} {p95:>10.2f} {baseline / median:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
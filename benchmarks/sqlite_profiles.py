@@ -0,0 +1,122 @@
+"""Booking and read throughput for each SQLite PRAGMA profile.
+
+    python -m benchmarks.sqlite_profiles [--sessions 2000] [--reads 4000] [--concurrency 8]
+
+Every profile gets a fresh database file in a temporary directory.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_NAME", ":memory:")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.database.database import Base, create_sqlite_engine  # noqa: E402
+from app.database.db_manager import DBManager  # noqa: E402
+from app.database.pragmas import PRAGMA_PROFILES  # noqa: E402
+from app.models import Master, Service, Session, User  # noqa: E402
+from app.schemes.appointment import AppointmentCreate  # noqa: E402
+
+DAY = datetime(2026, 1, 1)
+MASTERS = 20
+
+
+async def seed(session_factory, sessions: int) -> None:
+    async with session_factory() as db:
+        users = [User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x", role="client") for i in range(MASTERS)]
+        db.add_all(users)
+        await db.flush()
+        masters = [Master(user_id=user.id, name=user.username, specialization="hair") for user in users]
+        service = Service(name="Cut", duration=60, price=1500.0)
+        db.add_all(masters + [service])
+        await db.flush()
+        db.add_all(
+            Session(
+                master_id=masters[i % MASTERS].id, service_id=service.id, date=DAY,
+                start_time=DAY + timedelta(minutes=i), end_time=DAY + timedelta(minutes=i + 60),
+            )
+            for i in range(sessions)
+        )
+        await db.commit()
+
+
+async def book(session_factory, session_id: int) -> bool:
+    async with DBManager(session_factory) as db:
+        session = await db.sessions.get_by_id(session_id)
+        if not session or not session.is_available:
+            return False
+        await db.appointments.create(AppointmentCreate(
+            client_id=1, session_id=session.id, service_id=session.service_id, master_id=session.master_id,
+        ))
+        session.is_available = False
+        await db.commit()
+        return True
+
+
+async def read(session_factory, i: int) -> None:
+    async with DBManager(session_factory) as db:
+        await db.sessions.get_available_by_master_and_date(i % MASTERS + 1, DAY)
+
+
+async def run_concurrently(fn, session_factory, items, concurrency: int):
+    queue = list(items)
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while queue:
+            item = queue.pop()
+            try:
+                await fn(session_factory, item)
+            except OperationalError:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, errors
+
+
+async def bench_profile(name: str, directory: str, args) -> dict:
+    engine = create_sqlite_engine(f"sqlite+aiosqlite:///{directory}/{name}.db", PRAGMA_PROFILES[name])
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await seed(session_factory, args.sessions)
+        booking_time, booking_errors = await run_concurrently(
+            book, session_factory, range(1, args.sessions + 1), args.concurrency
+        )
+        read_time, read_errors = await run_concurrently(read, session_factory, range(args.reads), args.concurrency)
+    finally:
+        await engine.dispose()
+    return {
+        "profile": name,
+        "bookings/s": args.sessions / booking_time,
+        "booking errors": booking_errors,
+        "reads/s": args.reads / read_time,
+        "read errors": read_errors,
+    }
+
+
+async def main(args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        results = [await bench_profile(name, directory, args) for name in PRAGMA_PROFILES]
+    print(f"{'profile':<10} {'bookings/s':>12} {'errors':>8} {'reads/s':>12} {'errors':>8}")
+    for r in results:
+        print(f"{r['profile']:<10} {r['bookings/s']:>12.1f} {r['booking errors']:>8} {r['reads/s']:>12.1f} {r['read errors']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000, help="bookable sessions, one booking each")
+    parser.add_argument("--reads", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
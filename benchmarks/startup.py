@@ -0,0 +1,106 @@
+"""Time from process start to the first response of create_app().
+
+    python -m benchmarks.startup [--runs 10] [--budget-ms 1500]
+
+Every run is a fresh interpreter against a migrated database file, so
+imports, create_app(), the lifespan startup (schema version check, writer
+task) and the first GET /clients/services are all cold. The total is
+measured by this process from spawning the child until the child reports
+the response, which includes interpreter startup. Exits with status 1 if
+the median total is over the budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PROBE = """
+import time
+started = time.perf_counter()
+import asyncio, json, httpx
+import main
+imported = time.perf_counter()
+app = main.create_app()
+created = time.perf_counter()
+
+async def probe():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get("/clients/services")
+        responded = time.perf_counter()
+        print(json.dumps({
+            "status": response.status_code,
+            "import": (imported - started) * 1000,
+            "create_app": (created - imported) * 1000,
+            "lifespan": (ready - created) * 1000,
+            "first_response": (responded - ready) * 1000,
+        }), flush=True)
+
+asyncio.run(probe())
+"""
+
+PHASES = ("import", "create_app", "lifespan", "first_response")
+
+
+def migrate(env) -> None:
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=ROOT, env=env, check=True, capture_output=True,
+    )
+
+
+def run_once(env) -> dict:
+    spawned = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True
+    )
+    line = child.stdout.readline()
+    total = (time.perf_counter() - spawned) * 1000
+    child.wait()
+    if not line:
+        raise RuntimeError(f"Probe exited with status {child.returncode}")
+    timings = json.loads(line)
+    if timings["status"] != 200:
+        raise RuntimeError(f"First request returned {timings['status']}")
+    timings["total"] = total
+    return timings
+
+
+def main(args) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            DB_NAME=os.path.join(directory, "startup.db"),
+            JWT_ALGORITHM="HS256",
+            JWT_SECRET_KEY="benchmark",
+            SLOW_QUERY_LOG_FILE=os.path.join(directory, "slow_queries.log"),
+            PYTHONPATH=str(ROOT),
+        )
+        migrate(env)
+        runs = [run_once(env) for _ in range(args.runs)]
+
+    print(f"{'phase':<16} {'median ms':>10} {'max ms':>10}")
+    for phase in PHASES + ("total",):
+        values = [run[phase] for run in runs]
+        print(f"{phase:<16} {statistics.median(values):>10.1f} {max(values):>10.1f}")
+
+    median_total = statistics.median(run["total"] for run in runs)
+    within = median_total <= args.budget_ms
+    print(f"\nmedian total {median_total:.0f} ms, budget {args.budget_ms} ms: {'ok' if within else 'OVER BUDGET'}")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    sys.exit(main(parser.parse_args()))
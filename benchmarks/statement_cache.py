@@ -0,0 +1,138 @@
+"""Per-call cost of rebuilding repository queries versus prebuilt statements.
+
+    python -m benchmarks.statement_cache [--calls 5000]
+
+"build" is constructing the select with its loader options plus the SQL
+compilation cache lookup, without touching the database. "execute" is the
+full round trip against an in-memory database, once with a statement built
+on every call (the old repository code) and once through the repository.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_NAME", ":memory:")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.database.database import Base  # noqa: E402
+from app.models import Appointment, Master, Service, Session, User  # noqa: E402
+from app.repositories import appointment, session, user  # noqa: E402
+from app.repositories import AppointmentRepository, SessionRepository, UserRepository  # noqa: E402
+
+DAY = datetime(2026, 1, 1)
+
+
+def fresh_user_by_username(username):
+    return select(User).where(User.username == username)
+
+
+def fresh_available_sessions(master_id, date):
+    return (
+        select(Session)
+        .options(selectinload(Session.master))
+        .options(selectinload(Session.service))
+        .where(Session.master_id == master_id)
+        .where(Session.date == date)
+        .where(Session.is_available == True)
+    )
+
+
+def fresh_appointments_by_client(client_id):
+    return (
+        select(Appointment)
+        .options(selectinload(Appointment.master))
+        .options(selectinload(Appointment.service))
+        .options(selectinload(Appointment.session))
+        .where(Appointment.client_id == client_id)
+    )
+
+
+# name -> (fresh builder, args, prebuilt statement, repository class, method, args)
+QUERIES = {
+    "user by username": (
+        fresh_user_by_username, ("user1",),
+        user._select_by_username, UserRepository, "get_by_username", ("user1",),
+    ),
+    "sessions by master/date": (
+        fresh_available_sessions, (1, DAY),
+        session._select_available_by_master_and_date, SessionRepository, "get_available_by_master_and_date", (1, DAY),
+    ),
+    "appointments by client": (
+        fresh_appointments_by_client, (1,),
+        appointment._select_by_client_id, AppointmentRepository, "get_by_client_id", (1,),
+    ),
+}
+
+
+async def seed(session_factory) -> None:
+    async with session_factory() as db:
+        users = [User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x", role="client") for i in range(10)]
+        db.add_all(users)
+        await db.flush()
+        masters = [Master(user_id=u.id, name=u.username, specialization="hair") for u in users[:3]]
+        service = Service(name="Cut", duration=60, price=1500.0)
+        db.add_all(masters + [service])
+        await db.flush()
+        sessions = [
+            Session(
+                master_id=masters[i % 3].id, service_id=service.id, date=DAY,
+                start_time=DAY + timedelta(hours=i), end_time=DAY + timedelta(hours=i + 1),
+                is_available=i % 2 == 0,
+            )
+            for i in range(12)
+        ]
+        db.add_all(sessions)
+        await db.flush()
+        db.add_all(
+            Appointment(client_id=users[0].id, session_id=s.id, service_id=service.id, master_id=s.master_id)
+            for s in sessions if not s.is_available
+        )
+        await db.commit()
+
+
+def per_call_us(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def per_call_us_async(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        await fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def main(args) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_factory)
+
+    print(f"{'query':<26} {'build us':>10} {'prebuilt us':>12} {'execute us':>12} {'repository us':>14}")
+    async with session_factory() as db:
+        for name, (fresh, fresh_args, prebuilt, repository, method, method_args) in QUERIES.items():
+            build = per_call_us(lambda: fresh(*fresh_args)._generate_cache_key(), args.calls)
+            reuse = per_call_us(lambda: prebuilt._generate_cache_key(), args.calls)
+            fresh_execute = await per_call_us_async(lambda: db.execute(fresh(*fresh_args)), args.calls)
+            repository_call = await per_call_us_async(
+                lambda: getattr(repository(db), method)(*method_args), args.calls
+            )
+            print(f"{name:<26} {build:>10.1f} {reuse:>12.1f} {fresh_execute:>12.1f} {repository_call:>14.1f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
@@ -1,17 +1,59 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from app.database.database import engine
+from app.database.maintenance import maintenance
 from app.database.db_manager import create_all_tables
-from app.api import auth, clients, masters, admin
+from app.database.schema_version import check_schema_version
+from app.database.writer import write_queue
+from app.services.auth import password_pool
+from app.api import auth, clients, masters, admin, web, reviews, statistics, metrics
+from app.config import settings
+from app.middleware import CompressionMiddleware, MetricsMiddleware, query_stats_middleware
+from app.utils.metrics import EventLoopMonitor
+from app.utils.static_assets import AssetFiles, assets
+
+
+event_loop_monitor = EventLoopMonitor(settings.METRICS_EVENT_LOOP_INTERVAL_MS / 1000)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await create_all_tables()
+    if settings.DB_NAME == ":memory:":
+        # A fresh in-memory database has nothing to migrate
+        await create_all_tables()
+    else:
+        await check_schema_version(engine, settings.DB_SCHEMA_CHECK)
+    write_queue.start()
+    if settings.METRICS_ENABLED:
+        event_loop_monitor.start()
+    if settings.MAINTENANCE_ENABLED:
+        maintenance.start()
     yield
+    await maintenance.stop()
+    await event_loop_monitor.stop()
+    await write_queue.stop()
+    password_pool.shutdown()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(lifespan=lifespan)
+    # Routes that return dicts or single models are encoded by orjson;
+    # list routes write their JSON themselves (app.utils.serialization).
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+    
+    # Innermost: the "http" middleware below streams every body, which
+    # would hide the response size from the compression threshold.
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        )
+    if settings.QUERY_STATS_ENABLED:
+        app.middleware("http")(query_stats_middleware)
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
     
     # Include API routers
     app.include_router(auth.router)
@@ -21,6 +63,9 @@ def create_app() -> FastAPI:
     app.include_router(web.router)
     app.include_router(reviews.router)
     app.include_router(statistics.router)
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics.router)
+    app.mount("/static", AssetFiles(assets=assets), name="static")
 
     @app.get("/")
     def read_root():
@@ -8,10 +8,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 from app.database.database import Base
 from app.config import settings
-
-# TODO Добавить сюда импорт созданных моделей
-# Пример:
-# from app.models.users import UsersModel
+import app.models  # noqa: F401 - registers the models on Base.metadata
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -62,6 +59,12 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
+    # Lets the maintenance scheduler return free pages with
+    # PRAGMA incremental_vacuum. Only takes effect on a new, empty database.
+    cursor = connection.connection.cursor()
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    cursor.close()
+
     context.configure(connection=connection, target_metadata=target_metadata)
 
     with context.begin_transaction():
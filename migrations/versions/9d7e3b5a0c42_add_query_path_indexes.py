@@ -0,0 +1,66 @@
+"""add query path indexes
+
+Revision ID: 9d7e3b5a0c42
+Revises: 4c1f2a9e8b31
+Create Date: 2026-10-19 10:47:05.902611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d7e3b5a0c42'
+down_revision: Union[str, Sequence[str], None] = '4c1f2a9e8b31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # MasterRepository.get_by_user_id
+    op.create_index(op.f('ix_masters_user_id'), 'masters', ['user_id'], unique=False)
+
+    # SessionRepository.get_by_master_and_date / get_available_by_master_and_date
+    op.create_index('ix_sessions_master_id_date', 'sessions', ['master_id', 'date'], unique=False)
+    op.create_index(
+        'ix_sessions_available_master_id_date',
+        'sessions',
+        ['master_id', 'date'],
+        unique=False,
+        sqlite_where=sa.text('is_available = 1'),
+    )
+
+    # AppointmentRepository.get_by_client_id / get_by_master_id, Session.appointment loads
+    op.create_index(op.f('ix_appointments_client_id'), 'appointments', ['client_id'], unique=False)
+    op.create_index(op.f('ix_appointments_master_id'), 'appointments', ['master_id'], unique=False)
+    op.create_index(op.f('ix_appointments_session_id'), 'appointments', ['session_id'], unique=False)
+    # Status reports filter by status and period
+    op.create_index('ix_appointments_status_created_at', 'appointments', ['status', 'created_at'], unique=False)
+
+    # ReviewRepository.get_by_master_id / get_by_client_id, Appointment.review loads
+    op.create_index(op.f('ix_reviews_master_id'), 'reviews', ['master_id'], unique=False)
+    op.create_index(op.f('ix_reviews_client_id'), 'reviews', ['client_id'], unique=False)
+    op.create_index(op.f('ix_reviews_appointment_id'), 'reviews', ['appointment_id'], unique=False)
+
+    # ShiftRepository.get_by_master_id / get_by_master_and_date
+    op.create_index('ix_shifts_master_id_date', 'shifts', ['master_id', 'date'], unique=False)
+
+    op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_shifts_master_id_date', table_name='shifts')
+    op.drop_index(op.f('ix_reviews_appointment_id'), table_name='reviews')
+    op.drop_index(op.f('ix_reviews_client_id'), table_name='reviews')
+    op.drop_index(op.f('ix_reviews_master_id'), table_name='reviews')
+    op.drop_index('ix_appointments_status_created_at', table_name='appointments')
+    op.drop_index(op.f('ix_appointments_session_id'), table_name='appointments')
+    op.drop_index(op.f('ix_appointments_master_id'), table_name='appointments')
+    op.drop_index(op.f('ix_appointments_client_id'), table_name='appointments')
+    op.drop_index('ix_sessions_available_master_id_date', table_name='sessions')
+    op.drop_index('ix_sessions_master_id_date', table_name='sessions')
+    op.drop_index(op.f('ix_masters_user_id'), table_name='masters')
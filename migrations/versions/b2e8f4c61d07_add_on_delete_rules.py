@@ -0,0 +1,68 @@
+"""add on delete rules
+
+Revision ID: b2e8f4c61d07
+Revises: 9d7e3b5a0c42
+Create Date: 2026-10-19 11:47:08.828466
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e8f4c61d07'
+down_revision: Union[str, Sequence[str], None] = '9d7e3b5a0c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The initial schema created unnamed foreign keys; the convention gives the
+# reflected ones a name batch mode can drop.
+naming_convention = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+}
+
+# table -> [(column, referred table, ON DELETE)], parents before children
+foreign_keys = {
+    'masters': [('user_id', 'users', 'CASCADE')],
+    'sessions': [('master_id', 'masters', 'CASCADE'), ('service_id', 'services', 'RESTRICT')],
+    'shifts': [('master_id', 'masters', 'CASCADE')],
+    'appointments': [
+        ('client_id', 'users', 'CASCADE'),
+        ('session_id', 'sessions', 'CASCADE'),
+        ('service_id', 'services', 'RESTRICT'),
+        ('master_id', 'masters', 'CASCADE'),
+    ],
+    'reviews': [
+        ('client_id', 'users', 'CASCADE'),
+        ('master_id', 'masters', 'CASCADE'),
+        ('appointment_id', 'appointments', 'CASCADE'),
+    ],
+}
+
+
+def _recreate_foreign_keys(with_ondelete: bool) -> None:
+    # Batch mode copies each table. Alembic connections do not enable
+    # PRAGMA foreign_keys, so dropping the old tables does not fire the
+    # cascades being added here.
+    for table, columns in foreign_keys.items():
+        with op.batch_alter_table(table, naming_convention=naming_convention) as batch_op:
+            for column, referred, ondelete in columns:
+                name = f'fk_{table}_{column}_{referred}'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(
+                    name, referred, [column], ['id'],
+                    ondelete=ondelete if with_ondelete else None,
+                )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_foreign_keys(with_ondelete=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_foreign_keys(with_ondelete=False)
@@ -0,0 +1,80 @@
+import itertools
+import os
+
+# Settings are read on import, so the environment is set up first. The
+# suite runs against a fresh in-memory database.
+os.environ.update(
+    DB_NAME=":memory:",
+    JWT_ALGORITHM="HS256",
+    JWT_SECRET_KEY="test-secret",
+    RATE_LIMIT_ENABLED="false",
+    MAINTENANCE_ENABLED="false",
+    SLOW_QUERY_LOG_ENABLED="false",
+)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import create_app
+
+_names = itertools.count(1)
+PASSWORD = "password123"
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One app (and database) for the whole run; tests create their own rows
+    with TestClient(create_app()) as client:
+        yield client
+
+
+def register(client, role: str) -> dict:
+    username = f"{role}{next(_names)}"
+    response = client.post("/auth/register", json={
+        "username": username, "email": f"{username}@example.com", "password": PASSWORD, "role": role,
+    })
+    assert response.status_code == 200, response.text
+    user = response.json()
+    token = client.post("/auth/login", data={"username": username, "password": PASSWORD}).json()["access_token"]
+    user["headers"] = {"Authorization": f"Bearer {token}"}
+    return user
+
+
+@pytest.fixture(scope="session")
+def admin(client):
+    return register(client, "admin")
+
+
+@pytest.fixture(scope="session")
+def catalog(client, admin):
+    """A master with a service and twenty free sessions on 2030-01-01."""
+    master_user = register(client, "master")
+    service = client.post(
+        "/admin/services", json={"name": "Haircut", "duration": 60, "price": 1500.0}, headers=admin["headers"]
+    ).json()
+    master = client.post(
+        "/admin/masters",
+        json={"user_id": master_user["id"], "name": "Anna", "specialization": "hair"},
+        headers=admin["headers"],
+    ).json()
+    sessions = [
+        {
+            "master_id": master["id"], "service_id": service["id"], "date": "2030-01-01T00:00:00",
+            "start_time": f"2030-01-01T{hour:02d}:00:00", "end_time": f"2030-01-01T{hour + 1:02d}:00:00",
+        }
+        for hour in range(20)
+    ]
+    result = client.post("/admin/import/sessions", json=sessions, headers=admin["headers"]).json()
+    return {
+        "master": master,
+        "master_user": master_user,
+        "service": service,
+        "session_ids": [row["id"] for row in result["rows"]],
+    }
+
+
+def book(client, user: dict, catalog: dict, session_id: int):
+    return client.post("/clients/appointments/book", json={
+        "client_id": user["id"], "session_id": session_id,
+        "service_id": catalog["service"]["id"], "master_id": catalog["master"]["id"],
+    }, headers=user["headers"])
@@ -0,0 +1,65 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.after_commit import after_commit
+from app.database.db_manager import DBManager
+from app.schemes.user import UserUpdate
+from app.utils.principal_cache import principal_cache
+from tests.conftest import register
+
+
+def test_principal_is_dropped_once_the_update_commits(client):
+    user = register(client, "client")
+    client.get("/auth/profile", headers=user["headers"])
+    assert principal_cache.get(user["id"]) is not None
+
+    async def update(email: str, commit: bool) -> bool:
+        async with DBManager() as db:
+            await db.users.update(user["id"], UserUpdate(email=email))
+            # Flushed but not committed: other requests still see the old row
+            cached = principal_cache.get(user["id"]) is not None
+            if commit:
+                await db.commit()
+        return cached
+
+    assert client.portal.call(update, "rolled-back@example.com", False)
+    assert principal_cache.get(user["id"]) is not None
+
+    assert client.portal.call(update, "committed@example.com", True)
+    assert principal_cache.get(user["id"]) is None
+
+
+def test_savepoint_rollback_keeps_the_outer_callbacks():
+    calls = []
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        try:
+            async with async_sessionmaker(bind=engine)() as session:
+                await session.execute(text("SELECT 1"))
+                after_commit(session, lambda: calls.append("outer"))
+                try:
+                    async with session.begin_nested():
+                        after_commit(session, lambda: calls.append("savepoint"))
+                        raise ValueError
+                except ValueError:
+                    pass
+                async with session.begin_nested():
+                    after_commit(session, lambda: calls.append("released"))
+                # Releasing a savepoint is not the commit
+                assert calls == []
+                await session.commit()
+
+                await session.execute(text("SELECT 1"))
+                after_commit(session, lambda: calls.append("rolled back"))
+                await session.rollback()
+                await session.execute(text("SELECT 1"))
+                await session.commit()
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
+    # The savepoint's own callback runs too: an extra invalidation is harmless
+    assert calls == ["outer", "savepoint", "released"]
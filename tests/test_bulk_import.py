@@ -0,0 +1,57 @@
+from app.config import settings
+from app.database.query_stats import track_queries
+from app.utils.principal_cache import principal_cache
+from tests.conftest import register
+
+
+def test_rows_without_ids_skip_the_key_lookup(client, admin, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_IMPORT_CHUNK_SIZE", 10)
+    rows = [{"name": f"Service {i}", "duration": 30, "price": 100.0} for i in range(30)]
+
+    with track_queries() as stats:
+        result = client.post("/admin/import/services", json=rows, headers=admin["headers"]).json()
+
+    assert result["created"] == 30
+    assert not [shape for shape in stats.shapes if shape.startswith("SELECT services.id, services.id")]
+    assert stats.repeated(2) == []
+
+
+def test_moving_a_master_invalidates_both_users(client, admin):
+    old_user, new_user = register(client, "master"), register(client, "master")
+    master = client.post(
+        "/admin/masters", json={"user_id": old_user["id"], "name": "Boris", "specialization": "beard"},
+        headers=admin["headers"],
+    ).json()
+    for user in (old_user, new_user):
+        assert client.get("/auth/profile", headers=user["headers"]).status_code == 200
+        assert principal_cache.get(user["id"]) is not None
+
+    rows = [{"id": master["id"], "user_id": new_user["id"], "name": "Boris", "specialization": "beard"}]
+    result = client.post("/admin/import/masters", json=rows, headers=admin["headers"]).json()
+
+    assert result["updated"] == 1
+    assert principal_cache.get(old_user["id"]) is None
+    assert principal_cache.get(new_user["id"]) is None
+    # The previous owner no longer resolves to the master profile
+    assert client.get("/masters/appointments", headers=old_user["headers"]).status_code == 404
+
+
+def test_failed_master_row_keeps_the_invalidations_of_the_others(client, admin):
+    old_user, new_user = register(client, "master"), register(client, "master")
+    master = client.post(
+        "/admin/masters", json={"user_id": old_user["id"], "name": "Vera", "specialization": "nails"},
+        headers=admin["headers"],
+    ).json()
+    for user in (old_user, new_user):
+        assert client.get("/auth/profile", headers=user["headers"]).status_code == 200
+
+    # The unknown user fails the chunk, which is then redone row by row
+    rows = [
+        {"id": master["id"], "user_id": new_user["id"], "name": "Vera", "specialization": "nails"},
+        {"user_id": 10 ** 6, "name": "Nobody", "specialization": "nails"},
+    ]
+    result = client.post("/admin/import/masters", json=rows, headers=admin["headers"]).json()
+
+    assert result["updated"] == 1 and result["failed"] == 1
+    assert principal_cache.get(old_user["id"]) is None
+    assert principal_cache.get(new_user["id"]) is None
@@ -0,0 +1,58 @@
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.after_commit import after_commit
+from app.database.database import Base
+from app.database.writer import WriteQueue
+from app.models import Service
+from app.schemes.service import ServiceCreate
+from app.utils.table_versions import table_versions
+
+
+def _create(name: str, calls: list, fail: bool = False):
+    async def run(db):
+        service = await db.services.create(ServiceCreate(name=name, duration=30, price=100.0))
+        after_commit(db.session, lambda: calls.append(name))
+        if fail:
+            raise ValueError(name)
+        return service.id
+    return run
+
+
+def test_failing_job_is_isolated_from_its_batch():
+    calls = []
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        # A long window so all three jobs land in one batch
+        writer = WriteQueue(session_maker, group_commit=True, group_window=0.5)
+        try:
+            results = await asyncio.gather(
+                writer.submit(_create("first", calls)),
+                writer.submit(_create("broken", calls, fail=True)),
+                writer.submit(_create("last", calls)),
+                return_exceptions=True,
+            )
+            async with session_maker() as session:
+                names = (await session.execute(select(Service.name).order_by(Service.id))).scalars().all()
+                count = await session.scalar(select(func.count()).select_from(Service))
+            return results, names, count, writer.stats()
+        finally:
+            await writer.stop()
+            await engine.dispose()
+
+    version = table_versions.get("services")
+    results, names, count, stats = asyncio.run(scenario())
+
+    assert isinstance(results[0], int) and isinstance(results[2], int)
+    assert isinstance(results[1], ValueError) and str(results[1]) == "broken"
+    assert names == ["first", "last"] and count == 2
+    assert stats["commits"] == 1 and stats["processed"] == 2 and stats["failed"] == 1
+    # The siblings' side effects survive the rolled back savepoint
+    assert {"first", "last"} <= set(calls)
+    assert table_versions.get("services") == version + 1
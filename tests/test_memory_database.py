@@ -0,0 +1,23 @@
+from app.config import settings
+from app.database.database import engine, read_engine
+from tests.conftest import book, register
+
+
+def test_reader_and_writer_share_the_memory_database():
+    assert settings.DB_NAME == ":memory:"
+    assert read_engine is not engine
+    assert read_engine.url == engine.url
+
+
+def test_register_and_book(client, catalog):
+    user = register(client, "client")
+    session_id = catalog["session_ids"].pop()
+
+    response = book(client, user, catalog, session_id)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "booked"
+
+    # The reader sees the writer's commit
+    appointments = client.get("/clients/appointments/my", headers=user["headers"]).json()
+    assert [appointment["session_id"] for appointment in appointments] == [session_id]
+    assert book(client, user, catalog, session_id).status_code == 400
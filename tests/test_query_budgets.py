@@ -0,0 +1,44 @@
+"""Statement budgets per endpoint.
+
+Each request runs with an empty principal cache, so the budget covers the
+worst case: authenticated routes include the user lookup. Every client has
+several appointments: a relationship loaded per row (N+1) pushes the count
+over the budget.
+"""
+import pytest
+
+from app.database.query_stats import assert_max_queries
+from app.utils.principal_cache import principal_cache
+from tests.conftest import book, register
+
+BUDGETS = [
+    ("/clients/services", None, 1),
+    ("/clients/masters", None, 2),
+    ("/clients/appointments/my", "client", 5),
+    ("/clients/appointments/my?fields=id,status", "client", 2),
+    ("/clients/sessions/available?master_id={master_id}&date=2030-01-01", None, 3),
+    ("/admin/services", "admin", 2),
+    ("/admin/masters", "admin", 3),
+    ("/admin/appointments", "admin", 6),
+    ("/masters/appointments", "master", 6),
+    ("/masters/schedule?date=2030-01-01", "master", 6),
+]
+
+
+@pytest.fixture(scope="module")
+def users(client, admin, catalog):
+    clients = [register(client, "client") for _ in range(3)]
+    for user in clients:
+        for _ in range(2):
+            assert book(client, user, catalog, catalog["session_ids"].pop()).status_code == 200
+    return {"client": clients[0], "admin": admin, "master": catalog["master_user"]}
+
+
+@pytest.mark.parametrize("url, role, budget", BUDGETS)
+def test_query_budget(client, catalog, users, url, role, budget):
+    headers = users[role]["headers"] if role else {}
+    url = url.format(master_id=catalog["master"]["id"])
+    principal_cache.clear()
+    with assert_max_queries(budget):
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
@@ -0,0 +1,154 @@
+"""Every repository read path must be served by an index.
+
+Each repository method runs against seeded data; the statements it issues
+go through ``EXPLAIN QUERY PLAN`` and the test fails on a full table scan.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, List, Sequence
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.db_manager import DBManager
+from app.models import User, Master, Service, Session, Appointment, Review, Shift
+
+DATE = datetime(2026, 1, 1)
+
+# Paged listings walk the primary key and stop after skip + limit rows,
+# so a SCAN in their plan is expected. get_recent walks it backwards
+# (ORDER BY id DESC) and stops after limit rows.
+PAGED_METHODS = {"get_all", "get_recent"}
+
+REPOSITORY_CALLS = {
+    "UserRepository.get_by_id": lambda db: db.users.get_by_id(1),
+    "UserRepository.get_by_username": lambda db: db.users.get_by_username("user1"),
+    "UserRepository.get_by_email": lambda db: db.users.get_by_email("user1@example.com"),
+    "UserRepository.get_all": lambda db: db.users.get_all(limit=10),
+    "MasterRepository.get_by_id": lambda db: db.masters.get_by_id(1),
+    "MasterRepository.get_by_user_id": lambda db: db.masters.get_by_user_id(1),
+    "MasterRepository.get_user_ids": lambda db: db.masters.get_user_ids([1, 2]),
+    "MasterRepository.get_all": lambda db: db.masters.get_all(limit=10),
+    "ServiceRepository.get_by_id": lambda db: db.services.get_by_id(1),
+    "ServiceRepository.get_all": lambda db: db.services.get_all(limit=10),
+    "SessionRepository.get_by_id": lambda db: db.sessions.get_by_id(1),
+    "SessionRepository.get_available_by_master_and_date": lambda db: db.sessions.get_available_by_master_and_date(1, DATE),
+    "SessionRepository.get_by_master_and_date": lambda db: db.sessions.get_by_master_and_date(1, DATE),
+    "SessionRepository.get_by_master_and_date(history)": lambda db: db.sessions.get_by_master_and_date(1, DATE, include_history=True),
+    "SessionRepository.get_all": lambda db: db.sessions.get_all(limit=10),
+    "AppointmentRepository.get_by_id": lambda db: db.appointments.get_by_id(1),
+    "AppointmentRepository.get_by_client_id": lambda db: db.appointments.get_by_client_id(1),
+    "AppointmentRepository.get_by_master_id": lambda db: db.appointments.get_by_master_id(1),
+    "AppointmentRepository.get_by_client_id(history)": lambda db: db.appointments.get_by_client_id(1, include_history=True),
+    "AppointmentRepository.get_by_master_id(history)": lambda db: db.appointments.get_by_master_id(1, include_history=True),
+    "AppointmentRepository.get_all": lambda db: db.appointments.get_all(limit=10),
+    "ReviewRepository.get_by_id": lambda db: db.reviews.get_by_id(1),
+    "ReviewRepository.get_by_master_id": lambda db: db.reviews.get_by_master_id(1),
+    "ReviewRepository.get_by_client_id": lambda db: db.reviews.get_by_client_id(1),
+    "ReviewRepository.get_all": lambda db: db.reviews.get_all(limit=10),
+    "ReviewRepository.get_recent": lambda db: db.reviews.get_recent(),
+    "ShiftRepository.get_by_id": lambda db: db.shifts.get_by_id(1),
+    "ShiftRepository.get_by_master_id": lambda db: db.shifts.get_by_master_id(1),
+    "ShiftRepository.get_by_master_and_date": lambda db: db.shifts.get_by_master_and_date(1, DATE),
+    "ShiftRepository.get_all": lambda db: db.shifts.get_all(limit=10),
+}
+
+
+def explain_query_plan(connection: Connection, statement: str, parameters: Any = None) -> List[str]:
+    """Return the detail column of ``EXPLAIN QUERY PLAN`` for a statement."""
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).all()
+    return [row[-1] for row in rows]
+
+
+def find_full_scans(plan: Sequence[str]) -> List[str]:
+    """Plan steps that read a whole table instead of searching an index.
+
+    ``SCAN t USING [COVERING] INDEX ...`` walks an index in order and is fine,
+    a bare ``SCAN t`` is not.
+    """
+    return [
+        step for step in plan
+        if step.startswith("SCAN ") and " USING " not in step and "CONSTANT ROW" not in step
+    ]
+
+
+async def _seed(db: AsyncSession) -> None:
+    users = [User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x", role="client") for i in range(200)]
+    db.add_all(users)
+    await db.flush()
+    masters = [Master(user_id=users[i].id, name=f"Master {i}", specialization="hair") for i in range(20)]
+    services = [Service(name=f"Service {i}", duration=60, price=1000.0) for i in range(5)]
+    db.add_all(masters + services)
+    await db.flush()
+    sessions = []
+    for day in range(30):
+        for master in masters:
+            date = DATE + timedelta(days=day)
+            sessions.append(Session(
+                master_id=master.id, service_id=services[0].id, date=date,
+                start_time=date, end_time=date + timedelta(hours=1), is_available=day % 2 == 0,
+            ))
+            db.add(Shift(master_id=master.id, date=date, start_time=date, end_time=date + timedelta(hours=8)))
+    db.add_all(sessions)
+    await db.flush()
+    for i, session in enumerate(sessions[:200]):
+        appointment = Appointment(
+            client_id=users[i].id, session_id=session.id, service_id=session.service_id,
+            master_id=session.master_id, status="completed" if i % 2 else "booked",
+        )
+        db.add(appointment)
+        await db.flush()
+        db.add(Review(client_id=users[i].id, master_id=session.master_id, appointment_id=appointment.id, rating=5))
+    await db.commit()
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    # A private database, so the plans do not depend on what other tests wrote
+    loop = asyncio.new_event_loop()
+    engine = create_async_engine("sqlite+aiosqlite://")
+    captured: List[tuple] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_maker() as db:
+            await _seed(db)
+        # No ANALYZE here: without sqlite_stat1 the planner assumes large
+        # tables, so a SCAN means no index can serve the query at all rather
+        # than "the seed data is small enough to read in full".
+
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    loop.run_until_complete(setup())
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    yield loop, session_maker, captured
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+
+
+async def _full_scans(session_maker, captured: List[tuple], name: str) -> List[str]:
+    async with DBManager(session_maker) as db:
+        captured.clear()
+        await REPOSITORY_CALLS[name](db)
+        statements = list(captured)
+        if name.split("(")[0].rsplit(".", 1)[1] in PAGED_METHODS:
+            statements = statements[1:]
+        connection = await db.session.connection()
+        scans = []
+        for statement, parameters in statements:
+            plan = await connection.run_sync(explain_query_plan, statement, parameters)
+            scans += [f"{step} in {' '.join(statement.split())}" for step in find_full_scans(plan)]
+        return scans
+
+
+@pytest.mark.parametrize("name", list(REPOSITORY_CALLS))
+def test_repository_query_uses_an_index(seeded, name):
+    loop, session_maker, captured = seeded
+    assert loop.run_until_complete(_full_scans(session_maker, captured, name)) == []
@@ -0,0 +1,46 @@
+import pytest
+
+from app import dependencies
+from app.config import settings
+from app.utils import rate_limit
+from app.utils.rate_limit import Rate, RateLimiter, RouteRateLimit, parse_rate
+from tests.conftest import PASSWORD, register
+
+
+def test_parse_rate():
+    assert parse_rate("10/minute") == Rate(capacity=10, period=60)
+    assert parse_rate("") is None
+    for value in ("0/minute", "-1/minute", "ten/minute", "10/week", "10"):
+        with pytest.raises(ValueError):
+            parse_rate(value)
+
+
+def test_bucket_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    limiter = RateLimiter(max_keys=10)
+    limits = [("key", Rate(capacity=2, period=60))]
+
+    assert limiter.acquire(limits) == 0
+    assert limiter.acquire(limits) == 0
+    assert limiter.acquire(limits) == pytest.approx(30)
+
+    # Half a period brings back one of the two tokens
+    now[0] += 30
+    assert limiter.acquire(limits) == 0
+    assert limiter.acquire(limits) == pytest.approx(30)
+    assert limiter.rejected == 2
+
+
+def test_login_limit_answers_429_with_retry_after(client, monkeypatch):
+    user = register(client, "client")
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(dependencies, "rate_limiter", RateLimiter(max_keys=10))
+    monkeypatch.setattr(dependencies, "login_rate_limit", RouteRateLimit("auth.login", per_user="2/minute"))
+    form = {"username": user["username"], "password": PASSWORD}
+
+    assert client.post("/auth/login", data=form).status_code == 200
+    assert client.post("/auth/login", data=form).status_code == 200
+    response = client.post("/auth/login", data=form)
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 60
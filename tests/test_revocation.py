@@ -0,0 +1,50 @@
+from app.config import settings
+from app.database.query_stats import track_queries
+from app.utils import revocation
+from app.utils.principal_cache import principal_cache
+from app.utils.revocation import RevocationList
+from tests.conftest import register
+
+
+def test_revocation_covers_older_tokens_until_it_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(revocation.time, "time", lambda: now[0])
+    revoked = RevocationList(retention=60)
+
+    revoked.revoke(1)
+    assert revoked.is_revoked(1, issued_at=999)
+    # Same second as the revocation
+    assert revoked.is_revoked(1, issued_at=1000)
+    assert not revoked.is_revoked(1, issued_at=1001)
+    assert not revoked.is_revoked(2, issued_at=999)
+
+    now[0] += 30
+    revoked.revoke(2)
+    now[0] += 20
+    revoked.revoke(1)
+    now[0] += 45
+    revoked.revoke(3)
+    # Revoking 1 again moved it behind 2, so only 2 has expired
+    assert len(revoked) == 2
+    assert revoked.is_revoked(1, issued_at=1049)
+    now[0] += 61
+    assert not revoked.is_revoked(3, issued_at=1000)
+
+
+def test_claims_fast_path_and_revoked_users(client, admin, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+    user = register(client, "admin")
+    principal_cache.clear()
+
+    with track_queries() as stats:
+        assert client.get("/admin/dashboard", headers=user["headers"]).status_code == 200
+    assert stats.count == 0
+
+    # A demotion revokes the claims: the token now takes the full path
+    client.post(
+        "/admin/import/users", json=[{"username": user["username"], "email": user["email"], "role": "client"}],
+        headers=admin["headers"],
+    )
+    with track_queries() as stats:
+        assert client.get("/admin/dashboard", headers=user["headers"]).status_code == 403
+    assert stats.count > 0
@@ -0,0 +1,35 @@
+from tests.conftest import book, register
+
+
+def test_list_returns_only_the_requested_fields(client, catalog):
+    services = client.get("/clients/services?fields=price,id").json()
+    assert services and all(set(service) == {"id", "price"} for service in services)
+
+    sessions = client.get(
+        f"/clients/sessions/available?master_id={catalog['master']['id']}&date=2030-01-01&fields=id,start_time"
+    ).json()
+    assert sessions and all(set(session) == {"id", "start_time"} for session in sessions)
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get("/clients/masters?fields=id,password_hash")
+    assert response.status_code == 400
+    assert "password_hash" in response.json()["detail"]
+
+
+def test_review_detail_and_lists(client, catalog):
+    user = register(client, "client")
+    appointment = book(client, user, catalog, catalog["session_ids"].pop()).json()
+    review = client.post("/clients/reviews", json={
+        "client_id": user["id"], "master_id": catalog["master"]["id"],
+        "appointment_id": appointment["id"], "rating": 5, "comment": "Great",
+    }, headers=user["headers"]).json()
+
+    # client_id is not requested but still needed for the permission check
+    response = client.get(f"/reviews/{review['id']}?fields=rating,comment", headers=user["headers"])
+    assert response.json() == {"rating": 5, "comment": "Great"}
+    other = register(client, "client")
+    assert client.get(f"/reviews/{review['id']}?fields=rating", headers=other["headers"]).status_code == 403
+
+    reviews = client.get(f"/reviews/client/{user['id']}?fields=id", headers=user["headers"]).json()
+    assert reviews == [{"id": review["id"]}]
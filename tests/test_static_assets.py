@@ -0,0 +1,63 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.middleware import CompressionMiddleware
+from app.utils.static_assets import IMMUTABLE, REVALIDATE, AssetFiles, StaticAssets, build
+
+CSS = b"body { color: #333; }\n" * 200
+
+
+@pytest.fixture(scope="module")
+def static(tmp_path_factory):
+    source = tmp_path_factory.mktemp("static")
+    (source / "css").mkdir()
+    (source / "css" / "site.css").write_bytes(CSS)
+    manifest = build(source)
+    assets = StaticAssets(str(source))
+    app = Starlette(routes=[Mount("/static", AssetFiles(assets=assets))])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, gzip_level=6, brotli_quality=4)
+    with TestClient(app) as client:
+        yield client, assets.url("css/site.css"), manifest
+
+
+def test_fingerprinted_file_is_served_precompressed_and_immutable(static):
+    client, url, manifest = static
+    assert url == f"/static/dist/{manifest['css/site.css']}"
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.content == CSS
+    assert response.headers["Cache-Control"] == IMMUTABLE
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+    response = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.content == CSS
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_plain_file_is_revalidated_with_a_weak_etag(static):
+    client, _, _ = static
+    # No precompressed variant: the middleware compresses it
+    response = client.get("/static/css/site.css", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Cache-Control"] == REVALIDATE
+    assert response.headers["Vary"] == "Accept-Encoding"
+    etag = response.headers["ETag"]
+    assert etag.startswith("W/")
+
+    response = client.get("/static/css/site.css", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["Cache-Control"] == REVALIDATE
+
+    response = client.get("/static/css/site.css", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert not response.headers["ETag"].startswith("W/")
+
+
+def test_app_static_files_name_accept_encoding_once(client):
+    response = client.get("/static/css/style.css", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Vary"] == "Accept-Encoding"
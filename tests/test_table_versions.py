@@ -0,0 +1,52 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.utils.table_versions import mark_changed, table_versions
+
+
+def test_services_etag_changes_after_an_update(client, admin):
+    service = client.post(
+        "/admin/services", json={"name": "Shave", "duration": 30, "price": 500.0}, headers=admin["headers"]
+    ).json()
+    response = client.get("/clients/services")
+    etag = response.headers["ETag"]
+    assert client.get("/clients/services", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/admin/services/{service['id']}", json={"price": 600.0}, headers=admin["headers"])
+    response = client.get("/clients/services", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_savepoint_rollback_keeps_the_changed_tables():
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        try:
+            async with async_sessionmaker(bind=engine)() as session:
+                await session.execute(text("SELECT 1"))
+                mark_changed(session, "probe")
+                try:
+                    async with session.begin_nested():
+                        raise ValueError
+                except ValueError:
+                    pass
+                async with session.begin_nested():
+                    mark_changed(session, "probe")
+                # Releasing a savepoint is not the commit
+                assert table_versions.get("probe") == 0
+                await session.commit()
+                committed = table_versions.get("probe")
+
+                await session.execute(text("SELECT 1"))
+                mark_changed(session, "probe")
+                await session.rollback()
+                await session.execute(text("SELECT 1"))
+                await session.commit()
+                return committed
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(scenario()) == 1
+    assert table_versions.get("probe") == 1
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+
+from app.utils.worker_pool import BoundedWorkerPool
+
+
+def test_cancelled_caller_keeps_the_slot_until_the_job_finishes():
+    pool = BoundedWorkerPool("test", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        task = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        # The thread is still blocked in the job
+        held = pool.pending
+        release.set()
+        for _ in range(100):
+            if not pool.pending:
+                break
+            await asyncio.sleep(0.01)
+        return held, pool.pending
+
+    assert asyncio.run(scenario()) == (1, 0)
+    pool.shutdown()
+
+
+def test_shutdown_stops_the_worker_threads():
+    pool = BoundedWorkerPool("shutdown-test", max_workers=2, max_queue=0)
+    assert asyncio.run(pool.run(sum, [1, 2])) == 3
+    threads = [thread for thread in threading.enumerate() if thread.name.startswith("shutdown-test")]
+    assert threads
+
+    pool.shutdown()
+    for thread in threads:
+        thread.join(timeout=1)
+    assert not any(thread.is_alive() for thread in threads)
+    # The pool can be used again, e.g. by the next app lifespan
+    assert asyncio.run(pool.run(sum, [3, 4])) == 7
+    pool.shutdown()